@@ -1,25 +1,434 @@
+import argparse
+import asyncio
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from pandas.api.types import union_categoricals
 import logging
-import scipy.stats as stats
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# matplotlib and seaborn are imported inside the plotting functions, so
+# importing this module for loading and statistics stays lightweight.
+
+__all__ = [
+    "DEFAULT_COLUMNS",
+    "DEFAULT_DTYPES",
+    "load_data",
+    "load_data_chunks",
+    "load_shards",
+    "load_cached_dataset",
+    "NTDPanel",
+    "PrefixSumIndex",
+    "rank_top",
+    "rank_by_group",
+    "country_totals",
+    "yearly_totals",
+    "compute_totals",
+    "apply_incremental_update",
+    "refresh_dataset",
+    "load_arrow",
+    "write_arrow",
+    "fetch_cached",
+    "fetch_gho_async",
+    "load_gho",
+    "parse_formatted_numbers",
+    "value_mismatches",
+    "convert_numeric_columns",
+    "fold_constant_columns",
+    "restore_constants",
+    "build_location_dictionary",
+    "encode_identifiers",
+    "clean_dataset",
+    "normalize_schema",
+    "MomentAccumulator",
+    "QuantileSketch",
+    "HeavyHitterSketch",
+    "StreamingHistogram",
+    "perform_statistical_analysis",
+    "perform_grouped_analysis",
+    "NTDQuery",
+    "print_statistics_report",
+    "aggregate_stream",
+    "perform_streaming_analysis",
+    "DuckDBBackend",
+    "visualize_top_countries",
+    "plot_histogram",
+    "plot_trends_with_improved_annotations",
+    "use_headless_backend",
+    "render_charts",
+    "build_chart_jobs",
+    "render_chart_jobs",
+    "main",
+]
+
+# Directory where load_cached_dataset keeps the cleaned columnar copies
+CACHE_DIR = ".ntd_cache"
+
+# Resolution of charts saved by the headless rendering mode
+CHART_DPI = 150
+
+# Columns the analysis actually uses; the remaining GHO columns are empty or
+# single-valued in the WHO exports and are dropped by clean_dataset anyway.
+DEFAULT_COLUMNS = [
+    "Location",
+    "SpatialDimValueCode",
+    "Period",
+    "FactValueNumeric",
+    "Value",
+    "IsLatestYear",
+]
+
+# Columns exposed as zero-copy buffers by load_arrow
+ZERO_COPY_COLUMNS = ["Location", "Period", "FactValueNumeric"]
+
+# File extensions load_data reads as Arrow IPC or Parquet instead of CSV
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+# Compressed CSV inputs decompressed in a background thread while pandas parses
+GZIP_EXTENSIONS = (".gz",)
+ZSTD_EXTENSIONS = (".zst", ".zstd")
+DECOMPRESS_BLOCK_SIZE = 1 << 20
+DECOMPRESS_READ_AHEAD = 8
+
+# Key identifying a row across WHO releases, used by apply_incremental_update
+INCREMENTAL_KEY = ["IndicatorCode", "SpatialDimValueCode", "Period"]
+
+# On-disk cache of remote (http/https) datasets, revalidated with ETag/Last-Modified
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+HTTP_CACHE_MAX_BYTES = 2 * 1024 ** 3
+# Response manifests; bodies keep the URL's extension, which always starts with "."
+HTTP_CACHE_META_SUFFIX = "-meta.json"
+
+# WHO GHO OData API used by load_gho, and the "gho://CODE1,CODE2" load_data source
+GHO_API_URL = "https://ghoapi.azureedge.net/api"
+GHO_SCHEME = "gho://"
+GHO_MAX_CONNECTIONS = 8
+
+# Column layout of the GHO CSV export that load_data returns
+GHO_CSV_COLUMNS = [
+    "IndicatorCode", "Indicator", "ValueType", "ParentLocationCode", "ParentLocation",
+    "Location type", "SpatialDimValueCode", "Location", "Period type", "Period", "IsLatestYear",
+    "Dim1 type", "Dim1", "Dim1ValueCode", "Dim2 type", "Dim2", "Dim2ValueCode",
+    "Dim3 type", "Dim3", "Dim3ValueCode", "DataSourceDimValueCode", "DataSource",
+    "FactValueNumericPrefix", "FactValueNumeric", "FactValueUoM",
+    "FactValueNumericLowPrefix", "FactValueNumericLow", "FactValueNumericHighPrefix", "FactValueNumericHigh",
+    "Value", "FactValueTranslationID", "FactComments", "Language", "DateModified",
+]
+
+# GHO OData fields and the CSV export columns they map to
+GHO_FIELD_MAP = {
+    "IndicatorCode": "IndicatorCode",
+    "ParentLocationCode": "ParentLocationCode",
+    "ParentLocation": "ParentLocation",
+    "SpatialDimType": "Location type",
+    "SpatialDim": "SpatialDimValueCode",
+    "TimeDimType": "Period type",
+    "TimeDim": "Period",
+    "Dim1Type": "Dim1 type",
+    "Dim1": "Dim1ValueCode",
+    "Dim2Type": "Dim2 type",
+    "Dim2": "Dim2ValueCode",
+    "Dim3Type": "Dim3 type",
+    "Dim3": "Dim3ValueCode",
+    "DataSourceDim": "DataSourceDimValueCode",
+    "NumericValue": "FactValueNumeric",
+    "Low": "FactValueNumericLow",
+    "High": "FactValueNumericHigh",
+    "Value": "Value",
+    "Comments": "FactComments",
+    "Date": "DateModified",
+}
+
+# Dtypes declared up front so pandas skips type inference on load
+DEFAULT_DTYPES = {
+    "IndicatorCode": "category",
+    "ParentLocationCode": "category",
+    "ParentLocation": "category",
+    "Location": "category",
+    "SpatialDimValueCode": "category",
+    "Period": "Int16",
+    "FactValueNumeric": "float64",
+    "Value": "string",
+    "IsLatestYear": "boolean",
+    "DateModified": "string",
+}
+
+# Count columns normalize_schema stores as nullable integers when every value is whole
+COUNT_COLUMNS = ["FactValueNumeric", "FactValueNumericLow", "FactValueNumericHigh", "Value"]
+
+def _read_csv_kwargs(fast: bool, columns: list = None) -> dict:
+    """Builds the read_csv keyword arguments for the fast (schema-declared) mode."""
+    if not fast:
+        return {}
+    usecols = list(columns) if columns is not None else DEFAULT_COLUMNS
+    return {
+        "usecols": usecols,
+        "dtype": {col: DEFAULT_DTYPES[col] for col in usecols if col in DEFAULT_DTYPES},
+    }
+
+class _ReadAheadStream(io.RawIOBase):
+    """
+    Binary stream that reads (and so decompresses) blocks from a source in a
+    background thread, keeping up to `depth` blocks ready. Decompression then
+    runs on a second core while the CSV parser consumes the previous block.
+    """
+
+    def __init__(self, raw, block_size: int = DECOMPRESS_BLOCK_SIZE, depth: int = DECOMPRESS_READ_AHEAD):
+        super().__init__()
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._block = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, args=(raw, block_size), daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        """Queues an item, giving up if the reader has been closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _fill(self, raw, block_size: int):
+        """Background thread: reads blocks until EOF, passing errors to the reader."""
+        try:
+            with raw:
+                while not self._stop.is_set():
+                    block = raw.read(block_size)
+                    self._put(block)
+                    if not block:
+                        return
+        except Exception as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._block:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._block = memoryview(item)
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        return size
+
+    def close(self):
+        self._stop.set()
+        super().close()
+
+def _open_source(file_path: str):
+    """
+    Opens a .gz or .zst CSV as a streaming, read-ahead decompressed binary
+    handle (using isal's igzip for gzip when installed). Other paths are
+    passed through unchanged for pandas to open.
+    """
+    lower = str(file_path).lower()
+    if lower.endswith(GZIP_EXTENSIONS):
+        try:
+            from isal import igzip as gzip_module
+        except ImportError:
+            import gzip as gzip_module
+        raw = gzip_module.open(file_path, "rb")
+    elif lower.endswith(ZSTD_EXTENSIONS):
+        import zstandard
+
+        raw = zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), read_size=DECOMPRESS_BLOCK_SIZE)
+    else:
+        return contextlib.nullcontext(file_path)
+    return io.BufferedReader(_ReadAheadStream(raw), buffer_size=DECOMPRESS_BLOCK_SIZE)
+
+def _evict_http_cache(cache_dir: str, max_bytes: int, keep: str):
+    """Deletes least recently used responses until the cache fits in max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(HTTP_CACHE_META_SUFFIX):
+            meta_path = os.path.join(cache_dir, name)
+            meta = _read_cache_manifest(meta_path)
+            if meta is not None:
+                entries.append((meta.get("last_used", 0), meta_path, meta))
 
-def load_data(file_path: str) -> pd.DataFrame:
+    total = sum(meta.get("size", 0) for _, _, meta in entries)
+    for _, meta_path, meta in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        if meta["body"] == keep:
+            continue
+        for path in (meta["body"], meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        total -= meta.get("size", 0)
+        logging.info("🧹 Evicted cached response for %s", meta["url"])
+
+def fetch_cached(url: str, cache_dir: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 timeout: float = 60) -> str:
+    """
+    Downloads a remote dataset into an on-disk cache and returns the local path.
+
+    A cached copy is revalidated with If-None-Match / If-Modified-Since, so
+    bytes are only transferred when the server has a new revision. The cache
+    is bounded to max_bytes by evicting the least recently used responses.
+
+    Parameters:
+    - url: str, http(s) URL of the dataset
+    - cache_dir: str, directory holding the cached responses
+    - max_bytes: int, size bound of the cache
+    - timeout: float, request timeout in seconds
+
+    Returns:
+    - Local path of the cached copy (it keeps the URL's file extension)
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    suffix = re.search(r"(\.[A-Za-z0-9]+)*$", os.path.basename(urllib.parse.urlparse(url).path)).group(0)
+    body_path = os.path.join(cache_dir, key + suffix)
+    meta_path = os.path.join(cache_dir, key + HTTP_CACHE_META_SUFFIX)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    meta = _read_cache_manifest(meta_path)
+    headers = {}
+    if meta is not None and os.path.exists(body_path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            partial_path = body_path + ".part"
+            with open(partial_path, "wb") as fh:
+                shutil.copyfileobj(response, fh, DECOMPRESS_BLOCK_SIZE)
+            os.replace(partial_path, body_path)
+            meta = {
+                "url": url,
+                "body": body_path,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": os.path.getsize(body_path),
+            }
+        logging.info("✅ Downloaded %s (%d bytes)", url, meta["size"])
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not headers:
+            raise
+        logging.info("✅ Not modified, using cached copy of %s", url)
+
+    meta["last_used"] = time.time()
+    _write_cache_manifest(meta_path, meta)
+    _evict_http_cache(cache_dir, max_bytes, keep=body_path)
+    return body_path
+
+def _is_remote(file_path: str) -> bool:
+    """Returns True for http(s) URLs, which are fetched through fetch_cached."""
+    return str(file_path).lower().startswith(("http://", "https://"))
+
+def _is_polars(df) -> bool:
+    """Returns True for Polars DataFrames and LazyFrames, without importing polars."""
+    return type(df).__module__.split(".")[0] == "polars"
+
+def _polars_collect(frame):
+    """Collects a LazyFrame with the streaming engine (older Polars: streaming=True)."""
+    if not hasattr(frame, "collect"):
+        return frame
+    try:
+        return frame.collect(engine="streaming")
+    except TypeError:
+        return frame.collect(streaming=True)
+
+def _scan_polars(file_path: str, columns: list = None):
+    """Lazily scans a CSV, Parquet or Arrow IPC file with Polars."""
+    import polars as pl
+
+    lower = str(file_path).lower()
+    if lower.endswith(PARQUET_EXTENSIONS):
+        frame = pl.scan_parquet(file_path)
+    elif lower.endswith(ARROW_EXTENSIONS):
+        frame = pl.scan_ipc(file_path)
+    else:
+        # Every column as text; clean_dataset casts the numeric ones
+        frame = pl.scan_csv(file_path, infer_schema_length=0)
+    return frame.select(columns) if columns is not None else frame
+
+def load_data(file_path: str, fast: bool = False, columns: list = None, engine: str = None) -> pd.DataFrame:
     """
     Loads data from a CSV file with error handling.
     
     Parameters:
-    - file_path: str, path to the CSV file.
+    - file_path: str, path to the CSV file (.csv.gz and .csv.zst are
+      decompressed on the fly).
+    - fast: bool, if True only the analysis columns are parsed, with pinned dtypes.
+    - columns: list, columns to parse in fast mode (default is DEFAULT_COLUMNS).
+    - engine: str, CSV parser engine passed to pandas (e.g. "pyarrow"), or
+      "polars" to return a Polars LazyFrame that the cleaning, statistics and
+      plotting functions accept in place of a DataFrame.
+    
+    Arrow IPC (.arrow, .feather, .ipc) and Parquet files are memory-mapped
+    through load_arrow instead of being parsed, and "gho://CODE1,CODE2"
+    fetches those indicators from the WHO GHO API through load_gho.
+    http(s) URLs are downloaded through the revalidating fetch_cached cache.
     
     Returns:
     - DataFrame if file is successfully loaded.
     - None if file is not found or unreadable.
     """
+    if str(file_path).startswith(GHO_SCHEME):
+        codes = [code for code in str(file_path)[len(GHO_SCHEME):].split(",") if code]
+        df = load_gho(codes)
+        if df is not None and fast:
+            df = df[list(columns) if columns is not None else DEFAULT_COLUMNS]
+        return df
+    if _is_remote(file_path):
+        try:
+            file_path = fetch_cached(file_path)
+        except Exception as e:
+            logging.error("❌ Could not fetch %s: %s", file_path, str(e))
+            return None
+    if engine == "polars":
+        try:
+            df = _scan_polars(file_path, (list(columns) if columns is not None else DEFAULT_COLUMNS) if fast else None)
+            logging.info("✅ Data lazily scanned with Polars: %s", file_path)
+            return df
+        except ImportError:
+            logging.error("❌ polars is required for engine='polars'.")
+            return None
+        except FileNotFoundError:
+            logging.error("❌ File not found at path: %s", file_path)
+            return None
+        except Exception as e:
+            logging.error("❌ Unexpected error: %s", str(e))
+            return None
+    if str(file_path).lower().endswith(ARROW_EXTENSIONS + PARQUET_EXTENSIONS):
+        return load_arrow(file_path, columns=(list(columns) if columns is not None else DEFAULT_COLUMNS) if fast else None)
+
+    read_kwargs = _read_csv_kwargs(fast, columns)
+    if engine is not None:
+        read_kwargs["engine"] = engine
+
     try:
-        df = pd.read_csv(file_path)
+        with _open_source(file_path) as source:
+            df = pd.read_csv(source, **read_kwargs)
         logging.info("✅ Data successfully loaded. Shape: %s", df.shape)
         return df
     except FileNotFoundError:
@@ -28,84 +437,1869 @@ def load_data(file_path: str) -> pd.DataFrame:
     except pd.errors.ParserError:
         logging.error("❌ Error parsing CSV. Check file format.")
         return None
+    except ImportError as e:
+        logging.error("❌ Missing optional dependency (CSV engine or decompressor): %s", str(e))
+        return None
+    except Exception as e:
+        logging.error("❌ Unexpected error: %s", str(e))
+        return None
+
+def write_arrow(df: pd.DataFrame, file_path: str):
+    """
+    Writes a DataFrame to an uncompressed Arrow IPC file, the layout that
+    load_arrow can memory-map without copying.
+
+    Parameters:
+    - df: pd.DataFrame, usually the cleaned dataset
+    - file_path: str, destination path (e.g. "data.arrow")
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(file_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    logging.info("✅ Arrow file written to: %s", file_path)
+
+def load_arrow(file_path: str, columns: list = ZERO_COPY_COLUMNS) -> pd.DataFrame:
+    """
+    Loads an Arrow IPC or Parquet file through a memory map.
+
+    For uncompressed Arrow IPC files the columns are wrapped as pandas
+    ArrowDtype columns over the mapped pages, so concurrent processes share
+    one page-cached copy instead of each holding a private DataFrame.
+    Parquet pages still have to be decoded, so only the read is mapped.
+
+    Parameters:
+    - file_path: str, path to the .arrow/.feather/.ipc or .parquet file.
+    - columns: list, columns to expose (None for all columns).
+
+    Returns:
+    - DataFrame if file is successfully loaded.
+    - None if file is not found or unreadable.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logging.error("❌ pyarrow is required to read Arrow/Parquet files.")
+        return None
+
+    try:
+        if str(file_path).lower().endswith(PARQUET_EXTENSIONS):
+            table = pq.read_table(file_path, columns=columns, memory_map=True)
+        else:
+            table = pa.ipc.open_file(pa.memory_map(file_path, "r")).read_all()
+            if columns is not None:
+                table = table.select(columns)
+    except FileNotFoundError:
+        logging.error("❌ File not found at path: %s", file_path)
+        return None
+    except Exception as e:
+        logging.error("❌ Unexpected error: %s", str(e))
+        return None
+
+    # Dictionary-encoded identifiers become Categoricals (small code arrays);
+    # every other column stays an Arrow buffer view
+    df = table.to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+    logging.info("✅ Data successfully mapped. Shape: %s", df.shape)
+    return df
+
+def _gho_page_frame(records: list) -> pd.DataFrame:
+    """Maps one page of GHO OData records onto the CSV export column names."""
+    page = pd.DataFrame.from_records(records)
+    return page[[field for field in GHO_FIELD_MAP if field in page.columns]].rename(columns=GHO_FIELD_MAP)
+
+async def _fetch_gho_pages(session, url: str, to_frame: bool = True) -> list:
+    """Fetches a GHO OData resource, following @odata.nextLink pagination."""
+    pages = []
+    while url:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
+        records = payload.get("value", [])
+        pages.append(_gho_page_frame(records) if to_frame else records)
+        url = payload.get("@odata.nextLink")
+    return pages
+
+async def fetch_gho_async(indicator_codes: list, base_url: str = GHO_API_URL,
+                          max_connections: int = GHO_MAX_CONNECTIONS, timeout: float = 60) -> pd.DataFrame:
+    """
+    Fetches GHO indicator series concurrently over one pooled aiohttp session.
+
+    Each page is mapped onto the CSV export columns as it arrives. Country
+    and indicator names come from the GHO dimension endpoints, and
+    IsLatestYear is derived from the latest Period per indicator and country.
+
+    Parameters:
+    - indicator_codes: list, GHO IndicatorCode values (e.g. ["SDGNTDTREATMENT"])
+    - base_url: str, API root, so a local stand-in server can be used in tests
+    - max_connections: int, size of the HTTP connection pool
+    - timeout: float, total timeout per request in seconds
+
+    Returns:
+    - DataFrame in the column layout of the GHO CSV export.
+    - None if no indicator could be fetched.
+    """
+    import aiohttp
+
+    base_url = base_url.rstrip("/")
+    connector = aiohttp.TCPConnector(limit=max_connections)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        lookups = asyncio.gather(
+            _fetch_gho_pages(session, f"{base_url}/DIMENSION/COUNTRY/DimensionValues", to_frame=False),
+            _fetch_gho_pages(session, f"{base_url}/Indicator", to_frame=False),
+            return_exceptions=True,
+        )
+        series = asyncio.gather(
+            *(_fetch_gho_pages(session, f"{base_url}/{code}") for code in indicator_codes),
+            return_exceptions=True,
+        )
+        (countries, indicators), results = await asyncio.gather(lookups, series)
+
+    pages = []
+    for code, result in zip(indicator_codes, results):
+        if isinstance(result, Exception):
+            logging.error("❌ Could not fetch GHO indicator %s: %s", code, str(result))
+        else:
+            pages.extend(result)
+    if not pages:
+        return None
+    df = pd.concat(pages, ignore_index=True)
+    if df.empty:
+        return df.reindex(columns=GHO_CSV_COLUMNS)
+
+    if not isinstance(countries, Exception):
+        country_records = [record for page in countries for record in page]
+        names = {record["Code"]: record.get("Title") for record in country_records}
+        parent_codes = {record["Code"]: record.get("ParentCode") for record in country_records}
+        parent_names = {record["Code"]: record.get("ParentTitle") for record in country_records}
+        df["Location"] = df["SpatialDimValueCode"].map(names)
+        if "ParentLocationCode" not in df.columns:
+            df["ParentLocationCode"] = df["SpatialDimValueCode"].map(parent_codes)
+            df["ParentLocation"] = df["SpatialDimValueCode"].map(parent_names)
+    else:
+        logging.warning("⚠️ Could not fetch GHO country names: %s", str(countries))
+    if not isinstance(indicators, Exception):
+        indicator_names = {record["IndicatorCode"]: record.get("IndicatorName")
+                           for page in indicators for record in page}
+        df["Indicator"] = df["IndicatorCode"].map(indicator_names)
+
+    # The API uses upper-case dimension types ("COUNTRY", "YEAR")
+    for col in ("Location type", "Period type"):
+        if col in df.columns:
+            df[col] = df[col].str.title()
+    df["Period"] = pd.to_numeric(df["Period"], errors="coerce")
+    latest = df.groupby(["IndicatorCode", "SpatialDimValueCode"])["Period"].transform("max")
+    df["IsLatestYear"] = df["Period"] == latest
+    df["Language"] = "EN"
+
+    return df.reindex(columns=GHO_CSV_COLUMNS)
+
+def load_gho(indicator_codes: list, base_url: str = GHO_API_URL, max_connections: int = GHO_MAX_CONNECTIONS,
+             timeout: float = 60) -> pd.DataFrame:
+    """
+    Loads GHO indicator series from the OData API with error handling.
+    Code already running an event loop should await fetch_gho_async instead.
+
+    Parameters:
+    - indicator_codes: list, GHO IndicatorCode values (e.g. ["SDGNTDTREATMENT"])
+    - base_url: str, API root (default is the public GHO API)
+    - max_connections: int, size of the HTTP connection pool
+    - timeout: float, total timeout per request in seconds
+
+    Returns:
+    - DataFrame if the data is successfully loaded.
+    - None if aiohttp is missing or nothing could be fetched.
+    """
+    try:
+        df = asyncio.run(fetch_gho_async(indicator_codes, base_url=base_url,
+                                         max_connections=max_connections, timeout=timeout))
+    except ImportError:
+        logging.error("❌ aiohttp is required to fetch data from the GHO API.")
+        return None
     except Exception as e:
         logging.error("❌ Unexpected error: %s", str(e))
         return None
 
-def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None:
+        logging.error("❌ No GHO indicator could be fetched.")
+        return None
+    logging.info("✅ Data successfully fetched from GHO. Shape: %s", df.shape)
+    return df
+
+def load_data_chunks(file_path: str, chunksize: int = 100_000, fast: bool = True, columns: list = None):
+    """
+    Streams a CSV file in chunks, converting the numeric fields of each chunk.
+
+    Parameters:
+    - file_path: str, path to the CSV file (.csv.gz and .csv.zst are
+      decompressed on the fly).
+    - chunksize: int, number of rows per chunk.
+    - fast: bool, if True only the analysis columns are parsed, with pinned dtypes.
+    - columns: list, columns to parse in fast mode (default is DEFAULT_COLUMNS).
+
+    Yields:
+    - DataFrame chunks of at most chunksize rows.
+    - Stops early (after logging) if the file is not found or unreadable.
+    """
+    read_kwargs = _read_csv_kwargs(fast, columns)
+    try:
+        if _is_remote(file_path):
+            file_path = fetch_cached(file_path)
+        with _open_source(file_path) as source, pd.read_csv(source, chunksize=chunksize, **read_kwargs) as reader:
+            for chunk in reader:
+                yield convert_numeric_columns(chunk)
+    except FileNotFoundError:
+        logging.error("❌ File not found at path: %s", file_path)
+    except pd.errors.ParserError:
+        logging.error("❌ Error parsing CSV. Check file format.")
+    except Exception as e:
+        logging.error("❌ Unexpected error: %s", str(e))
+
+def parse_formatted_numbers(values: pd.Series) -> pd.Series:
+    """
+    Parses display-formatted numbers such as "1 234 567" (non-breaking-space
+    thousand separators) into floats.
+
+    The non-digit characters are stripped with a vectorised Arrow compute
+    kernel when pyarrow is installed, falling back to the pandas string regex.
+
+    Parameters:
+    - values: pd.Series, formatted numbers
+
+    Returns:
+    - pd.Series of floats (NaN where the text holds no number)
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype("float64")
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        digits = values.astype(str).str.replace(r"[^\d.]", "", regex=True)
+        return pd.to_numeric(digits, errors="coerce")
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    array = pa.array(values, type=pa.string(), from_pandas=True)
+    digits = pc.replace_substring_regex(array, pattern=r"[^\d.]", replacement="")
+    digits = pc.if_else(pc.equal(digits, ""), pa.scalar(None, pa.string()), digits)
+    try:
+        parsed = pc.cast(digits, pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        # Stray text such as "1.2.3": let pandas coerce it to NaN
+        parsed = pd.to_numeric(digits.to_pandas(), errors="coerce").to_numpy(dtype="float64")
+    return pd.Series(parsed, index=values.index, name=values.name)
+
+def _value_agreement(parsed: pd.Series, fact: pd.Series, rtol: float = 1e-9) -> np.ndarray:
+    """Rows where parsed 'Value' matches FactValueNumeric (both missing counts as a match)."""
+    return np.isclose(parsed.to_numpy(dtype="float64", na_value=np.nan),
+                      pd.to_numeric(fact, errors="coerce").to_numpy(dtype="float64", na_value=np.nan),
+                      rtol=rtol, atol=0.0, equal_nan=True)
+
+def value_mismatches(df: pd.DataFrame, rtol: float = 1e-9) -> pd.DataFrame:
+    """
+    Reports the rows where 'Value' and 'FactValueNumeric' disagree.
+
+    Parameters:
+    - df: pd.DataFrame, raw or cleaned dataset
+    - rtol: float, relative tolerance when comparing the two columns
+
+    Returns:
+    - DataFrame of the disagreeing rows, with the parsed 'Value' as 'ParsedValue'
+    """
+    parsed = parse_formatted_numbers(df["Value"])
+    agree = _value_agreement(parsed, df["FactValueNumeric"], rtol)
+
+    id_columns = [col for col in ("IndicatorCode", "SpatialDimValueCode", "Location", "Period") if col in df.columns]
+    report = df.loc[~agree, id_columns + ["Value", "FactValueNumeric"]].copy()
+    report.insert(len(id_columns) + 1, "ParsedValue", parsed[~agree])
+    return report
+
+def convert_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts the 'Value' and 'FactValueNumeric' fields to numeric.
+
+    'Value' is parsed on every row with the vectorised kernel of
+    parse_formatted_numbers, and a warning is logged if any row disagrees
+    with FactValueNumeric (see value_mismatches for the report).
+
+    Parameters:
+    - df: DataFrame, raw dataset or chunk
+
+    Returns:
+    - DataFrame with numeric 'Value' and 'FactValueNumeric' columns
+    """
+    # Ensure 'FactValueNumeric' is numeric
+    if "FactValueNumeric" in df.columns:
+        df["FactValueNumeric"] = pd.to_numeric(df["FactValueNumeric"], errors="coerce")
+
+    # Convert 'Value' column (formatted numbers) to numeric
+    if "Value" in df.columns:
+        value = parse_formatted_numbers(df["Value"])
+        if "FactValueNumeric" in df.columns:
+            agree = _value_agreement(value, df["FactValueNumeric"])
+            if not agree.all():
+                logging.warning("⚠️ 'Value' disagrees with 'FactValueNumeric' on %d rows; see value_mismatches().",
+                                int((~agree).sum()))
+        df["Value"] = value
+
+    return df
+
+def fold_constant_columns(df: pd.DataFrame, protected: list = DEFAULT_COLUMNS) -> pd.DataFrame:
+    """
+    Drops columns holding a single value on every row and records them in
+    df.attrs["constants"], so the working frame only carries varying data.
+
+    Parameters:
+    - df: DataFrame, dataset to fold
+    - protected: list, analysis columns that are never folded
+
+    Returns:
+    - DataFrame without the constant columns
+    """
+    constants = dict(df.attrs.get("constants", {}))
+    for col in df.columns:
+        if col in protected or len(df) == 0:
+            continue
+        first = df[col].iloc[0]
+        if pd.notna(first) and bool((df[col] == first).fillna(False).all()):
+            constants[col] = first.item() if isinstance(first, np.generic) else first
+
+    folded = df.drop(columns=[col for col in constants if col in df.columns])
+    folded.attrs["constants"] = constants
+    if constants:
+        logging.info("✅ Folded %d constant columns into metadata: %s", len(constants), list(constants))
+    return folded
+
+def restore_constants(df: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+    """
+    Reconstitutes folded constant columns, as single-category Categoricals
+    (one byte per row).
+
+    Parameters:
+    - df: DataFrame, dataset returned by fold_constant_columns
+    - columns: list, constant columns to restore (default is all of them)
+
+    Returns:
+    - DataFrame with the requested columns present
+    """
+    constants = df.attrs.get("constants", {})
+    wanted = [col for col in (constants if columns is None else columns) if col in constants and col not in df.columns]
+    if not wanted:
+        return df
+    codes = np.zeros(len(df), dtype="int8")
+    return df.assign(**{col: pd.Categorical.from_codes(codes, categories=[constants[col]]) for col in wanted})
+
+def build_location_dictionary(df: pd.DataFrame, dictionary: dict = None) -> dict:
+    """
+    Builds the ISO3 code -> country name dictionary of a dataset.
+
+    The dictionary is stable: codes already in `dictionary` keep their
+    position (and so their integer code), new codes are appended in sorted
+    order. Names come from the dataset (the last row of each code wins), so
+    a country renamed in a new release gets its new name.
+
+    Parameters:
+    - df: DataFrame, dataset with 'SpatialDimValueCode' and 'Location'
+    - dictionary: dict, an existing dictionary to extend
+
+    Returns:
+    - dict of ISO3 code to name, in code order
+    """
+    dictionary = dict(dictionary or {})
+    pairs = df[["SpatialDimValueCode", "Location"]].dropna().astype(str)
+    pairs = pairs.drop_duplicates(subset="SpatialDimValueCode", keep="last")
+    for code, name in sorted(pairs.itertuples(index=False, name=None)):
+        dictionary[code] = name
+    return dictionary
+
+def encode_identifiers(df: pd.DataFrame, dictionary: dict = None) -> pd.DataFrame:
+    """
+    Stores the identifier columns as Categoricals so grouping, filtering and
+    joining run on small integer codes.
+
+    SpatialDimValueCode and Location share one dictionary (kept in
+    df.attrs["locations"]), so a country has the same integer code in both
+    columns. Rows whose Location has no code, or differs from the dictionary
+    name of its code, keep their own Location. Location categories follow
+    the dictionary's code order, so results grouped by Location are sorted
+    by label afterwards (see country_totals and perform_grouped_analysis).
+    IndicatorCode and the ParentLocation columns get sorted categories.
+
+    Parameters:
+    - df: DataFrame, cleaned dataset
+    - dictionary: dict, an existing ISO3 code -> name dictionary to stay
+      consistent with (e.g. the previous release's df.attrs["locations"])
+
+    Returns:
+    - DataFrame with categorical identifier columns
+    """
+    df = df.copy(deep=False)
+    if "SpatialDimValueCode" in df.columns and "Location" in df.columns:
+        dictionary = build_location_dictionary(df, dictionary)
+        codes = df["SpatialDimValueCode"].astype(pd.CategoricalDtype(list(dictionary))).cat.codes.to_numpy()
+        df["SpatialDimValueCode"] = pd.Categorical.from_codes(codes, categories=list(dictionary))
+        names = list(dictionary.values())
+
+        # Location follows the code only where the row agrees with the dictionary
+        locations = df["Location"].astype(object)
+        # Code -1 (no code) indexes the trailing None, which matches no name
+        expected = np.array(names + [None], dtype=object)[codes]
+        matches = (codes >= 0) & (locations.to_numpy() == expected)
+        if len(set(names)) < len(names):
+            df["Location"] = locations.astype("category")
+        elif matches.all():
+            df["Location"] = pd.Categorical.from_codes(codes, categories=names)
+        else:
+            others = locations[~matches]
+            categories = names + sorted(set(others.dropna()) - set(names))
+            location_codes = codes.copy()
+            location_codes[~matches] = pd.Categorical(others, categories=categories).codes
+            df["Location"] = pd.Categorical.from_codes(location_codes, categories=categories)
+        df.attrs["locations"] = dictionary
+
+    for col in ("IndicatorCode", "ParentLocationCode", "ParentLocation"):
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+def _clean_polars(frame):
+    """Polars version of clean_dataset: drops empty columns and casts the numeric fields."""
+    import polars as pl
+
+    lazy = frame.lazy()
+    columns = lazy.collect_schema().names() if hasattr(lazy, "collect_schema") else lazy.columns
+
+    # One parallel pass to find the all-null columns
+    counts = _polars_collect(lazy.select([pl.len().alias("__rows")] + [pl.col(c).null_count() for c in columns]))
+    rows = counts["__rows"][0]
+    empty = [c for c in columns if counts[c][0] == rows]
+    lazy = lazy.drop(empty)
+
+    casts = []
+    if "Value" in columns and "Value" not in empty:
+        casts.append(pl.col("Value").cast(pl.Utf8).str.replace_all(r"[^\d.]", "").cast(pl.Float64, strict=False))
+    if "FactValueNumeric" in columns and "FactValueNumeric" not in empty:
+        casts.append(pl.col("FactValueNumeric").cast(pl.Float64, strict=False))
+    return lazy.with_columns(casts) if casts else lazy
+
+def normalize_schema(df: pd.DataFrame, force: bool = False) -> pd.DataFrame:
+    """
+    Casts the dataset to the canonical schema once, so later steps can use
+    the columns as they are instead of re-coercing them:
+    - Period as a compact nullable integer year (Int16)
+    - IsLatestYear as bool (missing counts as False)
+    - COUNT_COLUMNS as nullable integers (Int64) when all their values are
+      whole, float64 otherwise
+
+    The result is marked with df.attrs["normalized"] and returned as a new
+    frame; the input is never modified. Frames already marked are returned
+    unchanged unless force is True.
+
+    Parameters:
+    - df: pd.DataFrame, dataset after convert_numeric_columns
+    - force: bool, re-apply the casts to a frame already marked normalised
+
+    Returns:
+    - Normalised DataFrame
+    """
+    if df.attrs.get("normalized") and not force:
+        return df
+
+    # Shallow copy: columns are replaced, never written into
+    df = df.copy(deep=False)
+
+    if "Period" in df.columns:
+        df["Period"] = pd.to_numeric(df["Period"], errors="coerce").round().astype("Int16")
+
+    if "IsLatestYear" in df.columns:
+        flags = df["IsLatestYear"]
+        if not pd.api.types.is_bool_dtype(flags):
+            flags = flags.astype("string").str.strip().str.lower().map({"true": True, "false": False})
+        df["IsLatestYear"] = flags.astype("boolean").fillna(False).astype(bool)
+
+    for col in COUNT_COLUMNS:
+        if col not in df.columns or df[col].dtype == "Int64":
+            continue
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype("Int64")
+            continue
+        if not pd.api.types.is_float_dtype(df[col]):
+            continue
+        values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+        present = values[~np.isnan(values)]
+        if np.array_equal(present, np.round(present)) and np.all(np.abs(present) < 2 ** 53):
+            df[col] = pd.array(values, dtype="Float64").astype("Int64")
+        elif df[col].dtype != np.float64:
+            df[col] = values
+
+    df.attrs["normalized"] = True
+    return df
+
+def _numeric_periods(df: pd.DataFrame, time_col: str = "Period") -> pd.Series:
+    """Period as numbers, coercing only when the frame is not normalised."""
+    if time_col == "Period" and df.attrs.get("normalized"):
+        return df[time_col]
+    return pd.to_numeric(df[time_col], errors="coerce")
+
+def _label_order(index: pd.Index) -> pd.Index:
+    """
+    sort_index key that orders categorical levels by label rather than by
+    category order (Location categories follow the ISO3 code dictionary).
+    """
+    if isinstance(index.dtype, pd.CategoricalDtype):
+        return index.astype(str)
+    return index
+
+def _factorize_by_label(values: pd.Series):
+    """pd.factorize with the uniques in label order, also for categoricals."""
+    codes, uniques = pd.factorize(values, sort=True)
+    uniques = np.asarray(uniques)
+    order = np.argsort(uniques.astype(str), kind="stable")
+    positions = np.empty_like(order)
+    positions[order] = np.arange(len(order))
+    return np.where(codes >= 0, positions[codes], -1), uniques[order]
+
+def clean_dataset(df: pd.DataFrame, fold_constants: bool = False, categorical: bool = True) -> pd.DataFrame:
+    """
+    Cleans the dataset by:
+    - Removing empty columns
+    - Converting numeric fields properly
+    - Standardizing country names
+    - Storing identifiers as categoricals with a shared code dictionary
+    - Casting to the canonical schema (see normalize_schema)
+    - Optionally folding single-valued columns into df.attrs["constants"]
+    
+    Parameters:
+    - df: DataFrame, raw dataset
+    - fold_constants: bool, if True constant columns are moved into metadata
+      (see fold_constant_columns and restore_constants)
+    - categorical: bool, if True identifier columns are encoded (see encode_identifiers)
+    
+    A Polars LazyFrame (load_data(..., engine="polars")) is cleaned lazily
+    with the equivalent Polars expressions; the pandas-only options are ignored.
+    
+    Returns:
+    - Cleaned DataFrame
+    """
+    if _is_polars(df):
+        return _clean_polars(df)
+
+    # Drop empty columns
+    df = df.dropna(axis=1, how="all")
+
+    df = convert_numeric_columns(df)
+
+    if categorical:
+        df = encode_identifiers(df)
+
+    df = normalize_schema(df, force=True)
+
+    if fold_constants:
+        df = fold_constant_columns(df)
+
+    return df
+
+
+def _shard_paths(shards) -> list:
+    """Expands a glob pattern, a manifest file (one path per line) or a list into shard paths."""
+    if not isinstance(shards, str):
+        return list(shards)
+    if os.path.isfile(shards) and shards.lower().endswith((".txt", ".lst", ".manifest")):
+        with open(shards, encoding="utf-8") as fh:
+            lines = (line.strip() for line in fh)
+            return [line for line in lines if line and not line.startswith("#")]
+    return sorted(glob.glob(shards, recursive=True))
+
+def _load_shard(path: str, fast: bool, columns: list) -> pd.DataFrame:
+    """Process-pool worker: loads and cleans one shard, raising on failure."""
+    lower = str(path).lower()
+    if lower.endswith(PARQUET_EXTENSIONS):
+        df = pd.read_parquet(path, columns=(list(columns) if columns is not None else DEFAULT_COLUMNS) if fast else None)
+    elif lower.endswith(ARROW_EXTENSIONS):
+        df = pd.read_feather(path, columns=(list(columns) if columns is not None else DEFAULT_COLUMNS) if fast else None)
+    else:
+        with _open_source(path) as source:
+            df = pd.read_csv(source, **_read_csv_kwargs(fast, columns))
+    return clean_dataset(df)
+
+def _concat_column(parts: list, lengths: list):
+    """
+    Concatenates one column across shards with a single allocation; None
+    marks a shard that lacks the column.
+    """
+    present = [part for part in parts if part is not None]
+    total = sum(lengths)
+
+    if all(isinstance(part.dtype, pd.CategoricalDtype) for part in present):
+        # Missing shards become all-NaN categoricals; categories are unioned
+        pieces = [part.array if part is not None else pd.Categorical([None] * n) for part, n in zip(parts, lengths)]
+        try:
+            return union_categoricals(pieces)
+        except TypeError:
+            pass
+    elif len(present) == len(parts) and all(part.dtype == present[0].dtype for part in present):
+        if isinstance(present[0].dtype, np.dtype):
+            return np.concatenate([part.to_numpy() for part in present])
+        return pd.concat(present, ignore_index=True).array
+
+    # Mixed dtypes: one output array of the common numeric dtype, or object.
+    # Nullable extension dtypes (Int64, Float64, boolean) widen to float64;
+    # normalize_schema restores the canonical dtypes afterwards.
+    dtypes = [part.dtype for part in present]
+    if all(isinstance(dtype, np.dtype) and dtype.kind in "biuf" for dtype in dtypes):
+        dtype = np.result_type(*dtypes)
+        if len(present) < len(parts) or dtype.kind == "b":
+            dtype = np.result_type(dtype, np.float64)
+    elif all(pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+             for dtype in dtypes):
+        dtype = np.dtype("float64")
+    else:
+        dtype = np.dtype(object)
+    out = np.empty(total, dtype=dtype)
+    start = 0
+    for part, n in zip(parts, lengths):
+        if part is None:
+            out[start:start + n] = np.nan
+        elif dtype == object:
+            out[start:start + n] = part.to_numpy(dtype=object)
+        else:
+            out[start:start + n] = part.to_numpy(dtype=dtype, na_value=np.nan)
+        start += n
+    return out
+
+def load_shards(shards, fast: bool = False, columns: list = None, max_workers: int = None) -> tuple:
+    """
+    Loads many per-indicator / per-region CSV shards in parallel.
+
+    Shards are parsed and cleaned in a process pool, their columns unified
+    (columns missing from a shard are filled with NaN) and each column is
+    concatenated with a single final allocation.
+
+    Parameters:
+    - shards: str or list, a glob pattern, a manifest file listing one path
+      per line (.txt/.lst/.manifest), or a list of paths
+    - fast: bool, if True only the analysis columns are parsed, with pinned dtypes
+    - columns: list, columns to parse in fast mode (default is DEFAULT_COLUMNS)
+    - max_workers: int, number of worker processes (default is the CPU count)
+
+    Returns:
+    - (cleaned DataFrame or None if no shard loaded, dict of shard path to error message)
+    """
+    paths = _shard_paths(shards)
+    if not paths:
+        logging.error("❌ No shards matched: %s", shards)
+        return None, {}
+
+    frames = [None] * len(paths)
+    errors = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_load_shard, path, fast, columns): i for i, path in enumerate(paths)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                frames[i] = future.result()
+            except Exception as e:
+                errors[paths[i]] = f"{type(e).__name__}: {e}"
+                logging.error("❌ Could not load shard %s: %s", paths[i], errors[paths[i]])
+
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return None, errors
+
+    column_order = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    lengths = [len(frame) for frame in frames]
+    df = pd.DataFrame({
+        col: _concat_column([frame[col] if col in frame.columns else None for frame in frames], lengths)
+        for col in column_order
+    }, copy=False)
+    # Shards were encoded and normalised separately; give the result one
+    # shared dictionary and the canonical dtypes
+    df = encode_identifiers(df)
+    df = normalize_schema(df, force=True)
+    logging.info("✅ Loaded %d of %d shards. Shape: %s", len(frames), len(paths), df.shape)
+    return df, errors
+
+def _file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """Hashes a file in blocks so large exports are never read into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _cache_name(file_path: str) -> str:
+    """File name prefix of the cache of file_path, unique per absolute source path."""
+    path_hash = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:12]
+    return f"{os.path.basename(file_path)}-{path_hash}"
+
+def _cache_manifest_path(file_path: str, cache_dir: str) -> str:
+    """Returns the path of the JSON manifest describing the cache of file_path."""
+    return os.path.join(cache_dir, _cache_name(file_path) + ".manifest.json")
+
+def _read_cache_manifest(manifest_path: str) -> dict:
+    """Reads a cache manifest, returning None if it is missing or corrupt."""
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+def _write_cache_manifest(manifest_path: str, manifest: dict):
+    """Writes a cache manifest next to the cached dataset."""
+    with open(manifest_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+
+def _read_cache_file(cache_path: str, cache_format: str) -> pd.DataFrame:
+    """Reads a cached cleaned dataset, returning None if it cannot be read."""
+    try:
+        if cache_format == "feather":
+            df = pd.read_feather(cache_path)
+        else:
+            df = pd.read_parquet(cache_path)
+    except Exception as e:
+        logging.warning("⚠️ Could not read cache %s: %s", cache_path, str(e))
+        return None
+    return normalize_schema(df)
+
+def _stat_source(file_path: str):
+    """Resolves remote paths through fetch_cached and stats the local file, logging failures."""
+    try:
+        if _is_remote(file_path):
+            file_path = fetch_cached(file_path)
+        return file_path, os.stat(file_path)
+    except FileNotFoundError:
+        logging.error("❌ File not found at path: %s", file_path)
+    except Exception as e:
+        logging.error("❌ Could not fetch %s: %s", file_path, str(e))
+    return None, None
+
+def _read_manifest_for(file_path: str, cache_dir: str, cache_format: str, fast: bool):
+    """Returns the manifest path and the manifest, None if it was built for another source or settings."""
+    manifest_path = _cache_manifest_path(file_path, cache_dir)
+    manifest = _read_cache_manifest(manifest_path)
+    if manifest is not None and (manifest.get("source") != os.path.abspath(file_path)
+                                 or manifest.get("format") != cache_format or manifest.get("fast") != fast):
+        manifest = None
+    return manifest_path, manifest
+
+def _totals_to_json(totals: dict) -> dict:
+    """Converts the totals of compute_totals into a JSON-serialisable manifest entry."""
+    return {
+        "column": totals["column"],
+        "by_location": {str(k): float(v) for k, v in totals["by_location"].items()},
+        "by_period": {str(k): float(v) for k, v in totals["by_period"].items()},
+    }
+
+def _store_cached_dataset(df: pd.DataFrame, file_path: str, stat, sha256: str, cache_dir: str, cache_format: str,
+                          fast: bool, manifest_path: str, manifest: dict, aggregates: dict = None):
+    """Writes the cleaned dataset to the cache and records it (and its aggregates) in the manifest."""
+    date_modified = str(df["DateModified"].max()) if "DateModified" in df.columns else ""
+    key = sha256[:16] + ("-" + re.sub(r"[^0-9A-Za-z]", "", date_modified) if date_modified else "")
+    cache_path = os.path.join(cache_dir, f"{_cache_name(file_path)}-{key}.{cache_format}")
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if cache_format == "feather":
+            # Uncompressed, so workers can memory-map the cache with load_arrow
+            df.reset_index(drop=True).to_feather(cache_path, compression="uncompressed")
+        else:
+            df.to_parquet(cache_path, index=False)
+    except Exception as e:
+        logging.warning("⚠️ Could not write cache %s: %s", cache_path, str(e))
+        return
+
+    # Drop the cache file of the previous revision
+    if manifest is not None and manifest["cache_file"] != cache_path and os.path.exists(manifest["cache_file"]):
+        os.remove(manifest["cache_file"])
+
+    entry = {
+        "source": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+        "date_modified": date_modified,
+        "format": cache_format,
+        "fast": fast,
+        "cache_file": cache_path,
+    }
+    if aggregates is not None:
+        entry["aggregates"] = _totals_to_json(aggregates)
+    _write_cache_manifest(manifest_path, entry)
+    logging.info("✅ Cleaned dataset cached at: %s", cache_path)
+
+def load_cached_dataset(file_path: str, cache_dir: str = CACHE_DIR, cache_format: str = "parquet",
+                        fast: bool = False) -> pd.DataFrame:
+    """
+    Loads and cleans a CSV file, reusing a Parquet/Feather cache of the cleaned
+    dataset when the source file has not changed.
+
+    The cache is keyed by the SHA-256 of the source file and its DateModified
+    value. If the file size and modification time still match the manifest,
+    the source is not even re-hashed.
+
+    Parameters:
+    - file_path: str, path to the CSV file.
+    - cache_dir: str, directory holding the cache files and manifests.
+    - cache_format: str, "parquet" or "feather".
+    - fast: bool, if True only the analysis columns are parsed, with pinned dtypes.
+
+    Returns:
+    - Cleaned DataFrame.
+    - None if file is not found or unreadable.
+    """
+    file_path, stat = _stat_source(file_path)
+    if stat is None:
+        return None
+    manifest_path, manifest = _read_manifest_for(file_path, cache_dir, cache_format, fast)
+
+    # Unchanged size and mtime: trust the recorded hash
+    if manifest is not None and manifest["size"] == stat.st_size and manifest["mtime_ns"] == stat.st_mtime_ns:
+        df = _read_cache_file(manifest["cache_file"], cache_format)
+        if df is not None:
+            logging.info("✅ Loaded cleaned dataset from cache: %s", manifest["cache_file"])
+            return df
+
+    sha256 = _file_sha256(file_path)
+    if manifest is not None and manifest["sha256"] == sha256:
+        df = _read_cache_file(manifest["cache_file"], cache_format)
+        if df is not None:
+            manifest.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            _write_cache_manifest(manifest_path, manifest)
+            logging.info("✅ Loaded cleaned dataset from cache: %s", manifest["cache_file"])
+            return df
+
+    df = load_data(file_path, fast=fast)
+    if df is None:
+        return None
+    df = clean_dataset(df)
+
+    _store_cached_dataset(df, file_path, stat, sha256, cache_dir, cache_format, fast, manifest_path, manifest)
+    return df
+
+class NTDPanel:
+    """
+    Dense Location × Period panel of one column, backed by a contiguous
+    float64 NumPy array, so country totals, yearly totals and trends are
+    axis reductions instead of groupbys on the long-format frame.
+
+    values has shape (locations, periods), or (indicators, locations,
+    periods) when built with by_indicator=True. Rows sharing a cell are
+    summed; cells without any value are NaN and flagged in mask.
+
+    Attributes:
+    - values: np.ndarray, the panel (NaN where missing)
+    - mask: np.ndarray of bool, True where a cell is missing
+    - locations, periods, indicators: pd.Index labels of each axis
+    - location_index, period_index, indicator_index: dict, label → position
+    """
+
+    def __init__(self, values: np.ndarray, locations, periods, indicators=None, column: str = "FactValueNumeric"):
+        self.values = np.ascontiguousarray(values, dtype="float64")
+        self.mask = np.isnan(self.values)
+        self.locations = pd.Index(locations, name="Location")
+        self.periods = pd.Index(periods, name="Period")
+        self.indicators = pd.Index(indicators, name="IndicatorCode") if indicators is not None else None
+        self.column = column
+        self.location_index = {label: i for i, label in enumerate(self.locations)}
+        self.period_index = {label: i for i, label in enumerate(self.periods)}
+        self.indicator_index = ({label: i for i, label in enumerate(self.indicators)}
+                                if self.indicators is not None else {})
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = "FactValueNumeric", time_col: str = "Period",
+                   by_indicator: bool = False) -> "NTDPanel":
+        """
+        Builds the panel from a cleaned long-format DataFrame in one
+        vectorised pass (rows without a Location or Period are skipped).
+
+        Parameters:
+        - df: pd.DataFrame, cleaned dataset
+        - column: str, the column to place in the cells
+        - time_col: str, the column containing time information
+        - by_indicator: bool, if True stack one panel per IndicatorCode into a 3D array
+        """
+        keys = ["Location", time_col] + (["IndicatorCode"] if by_indicator else [])
+        df = restore_constants(df, keys)
+
+        periods = _numeric_periods(df, time_col).to_numpy(dtype="float64", na_value=np.nan)
+        known = ~np.isnan(periods)
+        period_labels, inverse = np.unique(periods[known], return_inverse=True)
+        period_codes = np.full(len(periods), -1, dtype="int64")
+        period_codes[known] = inverse
+        location_codes, locations = _factorize_by_label(df["Location"])
+
+        keep = (location_codes >= 0) & known
+        cell = location_codes * len(period_labels) + period_codes
+        shape = (len(locations), len(period_labels))
+
+        indicators = None
+        if by_indicator:
+            indicator_codes, indicators = _factorize_by_label(df["IndicatorCode"])
+            keep &= indicator_codes >= 0
+            cell = indicator_codes * (shape[0] * shape[1]) + cell
+            shape = (len(indicators),) + shape
+
+        cell = cell[keep]
+        values = df[column].to_numpy(dtype="float64", na_value=np.nan)[keep]
+        present = ~np.isnan(values)
+        size = int(np.prod(shape))
+        totals = np.bincount(cell[present], weights=values[present], minlength=size)
+        counts = np.bincount(cell[present], minlength=size)
+        totals[counts == 0] = np.nan
+
+        if period_labels.size and np.array_equal(period_labels, np.round(period_labels)):
+            period_labels = period_labels.astype("int64")
+        return cls(totals.reshape(shape), np.asarray(locations), period_labels,
+                   np.asarray(indicators) if indicators is not None else None, column)
+
+    def indicator(self, code) -> "NTDPanel":
+        """The 2D panel of one indicator of a stacked panel."""
+        if self.indicators is None:
+            raise ValueError("Panel is not stacked by indicator")
+        return NTDPanel(self.values[self.indicator_index[code]], self.locations, self.periods, column=self.column)
+
+    def cell(self, location, period) -> float:
+        """Value of one (Location, Period) cell, summed over indicators if stacked."""
+        values = self.values[..., self.location_index[location], self.period_index[period]]
+        return float(np.nansum(values)) if np.ndim(values) else float(values)
+
+    def country_totals(self) -> pd.Series:
+        """Sum per Location (missing cells count as 0)."""
+        axes = tuple(axis for axis in range(self.values.ndim) if axis != self.values.ndim - 2)
+        return pd.Series(np.nansum(self.values, axis=axes), index=self.locations, name=self.column)
+
+    def yearly_totals(self) -> pd.Series:
+        """Sum per Period, in time order (missing cells count as 0)."""
+        axes = tuple(range(self.values.ndim - 1))
+        return pd.Series(np.nansum(self.values, axis=axes), index=self.periods, name=self.column)
+
+    def observations(self) -> tuple:
+        """Flat arrays of the present cell values and their Periods."""
+        periods = np.broadcast_to(self.periods.to_numpy(dtype="float64"), self.values.shape)
+        present = ~self.mask
+        return self.values[present], periods[present]
+
+class PrefixSumIndex:
+    """
+    Cumulative sums of an NTDPanel along Period, so the total, average or
+    ranking of every Location over any year window [start, end] is two
+    array lookups per Location instead of a groupby on a filtered frame.
+
+    A stacked panel is summed over its indicators first. Revised cells are
+    applied with update, which only recomputes the prefix sums of that
+    Location from the revised Period on.
+    """
+
+    def __init__(self, panel: NTDPanel):
+        values = panel.values
+        if values.ndim == 3:
+            missing = np.isnan(values).all(axis=0)
+            values = np.nansum(values, axis=0)
+            values[missing] = np.nan
+        self.locations = panel.locations
+        self.periods = panel.periods
+        self.column = panel.column
+        self.location_index = dict(panel.location_index)
+        self.period_index = dict(panel.period_index)
+        self.values = np.array(values, dtype="float64")
+        self._period_values = self.periods.to_numpy(dtype="float64")
+
+        # Leading zero column: the sum of periods [i, j) is sums[:, j] - sums[:, i]
+        self.sums = np.zeros((len(self.locations), len(self.periods) + 1))
+        self.counts = np.zeros((len(self.locations), len(self.periods) + 1), dtype="int64")
+        self._accumulate(slice(None), 0)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str = "FactValueNumeric",
+                   time_col: str = "Period") -> "PrefixSumIndex":
+        """Builds the index from a cleaned long-format DataFrame."""
+        return cls(NTDPanel.from_frame(df, column, time_col))
+
+    def _accumulate(self, rows, start: int):
+        """Recomputes the prefix sums of the given rows from period position start on."""
+        present = ~np.isnan(self.values[rows, start:])
+        self.sums[rows, start + 1:] = self.sums[rows, start:start + 1] + np.cumsum(
+            np.where(present, self.values[rows, start:], 0.0), axis=-1)
+        self.counts[rows, start + 1:] = self.counts[rows, start:start + 1] + np.cumsum(present, axis=-1)
+
+    def _bounds(self, start, end) -> tuple:
+        """Prefix positions of the inclusive year window [start, end] (None leaves a side open)."""
+        low = 0 if start is None else int(np.searchsorted(self._period_values, start, side="left"))
+        high = len(self.periods) if end is None else int(np.searchsorted(self._period_values, end, side="right"))
+        return low, max(low, high)
+
+    def window_totals(self, start=None, end=None) -> pd.Series:
+        """Sum per Location over the years start..end (inclusive)."""
+        low, high = self._bounds(start, end)
+        return pd.Series(self.sums[:, high] - self.sums[:, low], index=self.locations, name=self.column)
+
+    def window_total(self, location, start=None, end=None) -> float:
+        """Sum of one Location over the years start..end (inclusive)."""
+        low, high = self._bounds(start, end)
+        row = self.location_index[location]
+        return float(self.sums[row, high] - self.sums[row, low])
+
+    def window_averages(self, start=None, end=None) -> pd.Series:
+        """Mean of the reported years per Location over start..end (NaN without any)."""
+        low, high = self._bounds(start, end)
+        counts = self.counts[:, high] - self.counts[:, low]
+        totals = self.sums[:, high] - self.sums[:, low]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = np.where(counts > 0, totals / counts, np.nan)
+        return pd.Series(averages, index=self.locations, name=self.column)
+
+    def window_ranking(self, start=None, end=None, top_n: int = None, ascending: bool = False) -> pd.Series:
+        """Locations ordered by their window total (ties by name), optionally the first top_n."""
+        totals = self.window_totals(start, end)
+        return rank_top(totals, len(totals) if top_n is None else top_n, ascending)
+
+    def update(self, location, period, value):
+        """
+        Revises one (Location, Period) cell (NaN clears it). Locations or
+        Periods not in the index require rebuilding it from the updated data.
+        """
+        row, col = self.location_index[location], self.period_index[period]
+        self.values[row, col] = value
+        self._accumulate(row, col)
+
+def _ranking_keys(values: np.ndarray, ascending: bool) -> np.ndarray:
+    """Sort keys where smaller ranks first; missing values rank last."""
+    return np.where(np.isnan(values), np.inf, values if ascending else -values)
+
+def rank_top(totals: pd.Series, n: int = 10, ascending: bool = False) -> pd.Series:
+    """
+    The n largest (or smallest) entries of a pre-aggregated Series, in rank
+    order, found by partial selection instead of sorting every entry. Ties
+    are broken by label, so the result does not depend on the input order.
+
+    Parameters:
+    - totals: pd.Series, e.g. from country_totals or PrefixSumIndex.window_totals
+    - n: int, number of entries to keep
+    - ascending: bool, if True return the bottom n instead
+
+    Returns:
+    - pd.Series of at most n entries, best first
+    """
+    n = max(0, min(n, len(totals)))
+    keys = _ranking_keys(totals.to_numpy(dtype="float64", na_value=np.nan), ascending)
+
+    # Everything at least as good as the n-th key, including all of its ties
+    candidates = np.arange(len(keys))
+    if 0 < n < len(keys):
+        candidates = np.flatnonzero(keys <= np.partition(keys, n - 1)[n - 1])
+    labels = totals.index.astype(str).to_numpy()[candidates]
+    order = candidates[np.lexsort((labels, keys[candidates]))][:n]
+    return totals.iloc[order]
+
+def rank_by_group(df: pd.DataFrame, by="Period", label: str = "Location", column: str = "FactValueNumeric",
+                  top_n: int = 10, bottom_n: int = 0) -> pd.DataFrame:
+    """
+    Top-N and bottom-N labels of every group (e.g. per Period, ParentLocation
+    or IndicatorCode) in one vectorised pass: one groupby to aggregate, one
+    lexsort per end, and the position within each group as the rank.
+    Ties are broken by label.
+
+    The aggregated (group, label) totals are sorted in full: NumPy has no
+    segmented argpartition, and a per-group selection through groupby
+    costs a Python call per group, which is far slower for many groups.
+    rank_top uses partial selection for a single ranking.
+
+    Parameters:
+    - df: pd.DataFrame, cleaned dataset
+    - by: str or list, grouping column(s)
+    - label: str, the column being ranked (default Location)
+    - column: str, the column summed per (group, label)
+    - top_n, bottom_n: int, how many labels to keep at each end of every group
+
+    Returns:
+    - DataFrame with the group columns, label, column, "position" ("top" or
+      "bottom") and "rank" (1 = best at that end)
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    df = restore_constants(df, keys + [label])
+    totals = df.groupby(keys + [label], observed=True)[column].sum().reset_index()
+
+    groups = totals.groupby(keys, observed=True, sort=True).ngroup().to_numpy()
+    values = totals[column].to_numpy(dtype="float64", na_value=np.nan)
+    labels = pd.factorize(totals[label].astype(str), sort=True)[0]
+
+    pieces = []
+    for position, n, ascending in (("top", top_n, False), ("bottom", bottom_n, True)):
+        if n <= 0:
+            continue
+        order = np.lexsort((labels, _ranking_keys(values, ascending), groups))
+        ordered_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, ordered_groups[1:] != ordered_groups[:-1]])
+        within = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        keep = within < n
+        piece = totals.iloc[order[keep]].reset_index(drop=True)
+        piece["position"] = position
+        piece["rank"] = within[keep] + 1
+        pieces.append(piece)
+
+    if not pieces:
+        return totals.iloc[:0].assign(position=pd.Series(dtype="object"), rank=pd.Series(dtype="int64"))
+    return pd.concat(pieces, ignore_index=True)
+
+def country_totals(df, column: str = "FactValueNumeric") -> pd.Series:
+    """
+    Sums a column per Location (pandas DataFrame, Polars frame or NTDPanel).
+
+    Returns:
+    - pd.Series indexed by Location, in alphabetical order
+    """
+    if isinstance(df, NTDPanel):
+        return df.country_totals()
+    if _is_polars(df):
+        import polars as pl
+
+        result = _polars_collect(df.lazy().filter(pl.col("Location").is_not_null())
+                                 .group_by("Location").agg(pl.col(column).sum()).sort("Location"))
+        return pd.Series(result[column].to_numpy(), index=pd.Index(result["Location"].to_list(), name="Location"),
+                         name=column)
+    return df.groupby("Location", observed=True)[column].sum().sort_index(key=_label_order)
+
+def yearly_totals(df, column: str = "FactValueNumeric", time_col: str = "Period") -> pd.Series:
+    """
+    Sums a column per numeric Period (pandas DataFrame, Polars frame or
+    NTDPanel), without modifying the input.
+
+    Returns:
+    - pd.Series indexed by Period, in time order
+    """
+    if isinstance(df, NTDPanel):
+        return df.yearly_totals()
+    if _is_polars(df):
+        import polars as pl
+
+        period = pl.col(time_col).cast(pl.Float64, strict=False)
+        result = _polars_collect(df.lazy().with_columns(period.alias(time_col)).filter(period.is_not_null())
+                                 .group_by(time_col).agg(pl.col(column).sum()).sort(time_col))
+        return pd.Series(result[column].to_numpy(), index=pd.Index(result[time_col].to_numpy(), name=time_col),
+                         name=column)
+    return df[column].groupby(_numeric_periods(df, time_col)).sum()
+
+def compute_totals(df: pd.DataFrame, column: str = "FactValueNumeric", time_col: str = "Period") -> dict:
+    """
+    Computes the per-Location and per-Period totals used by the charts.
+
+    Parameters:
+    - df: pd.DataFrame, cleaned dataset
+    - column: str, the column containing NTD case counts
+    - time_col: str, the column containing time information
+
+    Returns:
+    - dict with "column", "by_location" and "by_period" Series
+    """
+    return {
+        "column": column,
+        "by_location": country_totals(df, column),
+        "by_period": yearly_totals(df, column, time_col),
+    }
+
+def _differs(new: pd.Series, old: pd.Series) -> np.ndarray:
+    """Element-wise inequality where two missing values count as equal."""
+    new, old = new.astype(object), old.astype(object)
+    return (~((new == old) | (new.isna() & old.isna()))).to_numpy(dtype=bool)
+
+def _row_keys(stored: pd.DataFrame, other: pd.DataFrame, key: list) -> tuple:
+    """
+    One int64 key per row of stored and of other over the key columns, from
+    the categorical codes of stored (other is coded against its categories)
+    or a factorisation for other dtypes, so rows are matched without object
+    MultiIndexes. Rows with a missing or unknown key part get -1 (stored) or
+    -2 (other) and match nothing.
+    """
+    stored_keys = np.zeros(len(stored), dtype="int64")
+    other_keys = np.zeros(len(other), dtype="int64")
+    stored_missing = np.zeros(len(stored), dtype=bool)
+    other_missing = np.zeros(len(other), dtype=bool)
+    for col in key:
+        if isinstance(stored[col].dtype, pd.CategoricalDtype):
+            categories = stored[col].cat.categories
+            stored_codes = stored[col].cat.codes.to_numpy(dtype="int64")
+            other_codes = pd.Categorical(other[col], categories=categories).codes.astype("int64")
+            size = len(categories)
+        else:
+            codes, uniques = pd.factorize(pd.concat([stored[col], other[col]], ignore_index=True))
+            stored_codes, other_codes = codes[:len(stored)], codes[len(stored):]
+            size = len(uniques)
+        stored_missing |= stored_codes < 0
+        other_missing |= other_codes < 0
+        stored_keys = stored_keys * size + np.maximum(stored_codes, 0)
+        other_keys = other_keys * size + np.maximum(other_codes, 0)
+    stored_keys[stored_missing] = -1
+    other_keys[other_missing] = -2
+    return stored_keys, other_keys
+
+def _align_to_stored(stored: pd.DataFrame, delta: pd.DataFrame) -> tuple:
+    """
+    Makes delta concatenable with stored without re-encoding stored: its
+    categoricals are coded against stored's categories (new values are
+    appended to both), and numeric columns whose dtypes differ become float64.
+    """
+    stored, delta = stored.copy(deep=False), delta.copy(deep=False)
+    for col in stored.columns.intersection(delta.columns):
+        if isinstance(stored[col].dtype, pd.CategoricalDtype):
+            categories = stored[col].cat.categories
+            values = delta[col].astype(object)
+            extra = sorted((value for value in pd.unique(values.dropna()) if value not in categories), key=str)
+            if extra:
+                stored[col] = stored[col].cat.add_categories(extra)
+            delta[col] = pd.Categorical(values, categories=stored[col].cat.categories)
+        elif (stored[col].dtype != delta[col].dtype
+              and all(pd.api.types.is_numeric_dtype(frame[col]) and not pd.api.types.is_bool_dtype(frame[col])
+                      for frame in (stored, delta))):
+            stored[col] = stored[col].to_numpy(dtype="float64", na_value=np.nan)
+            delta[col] = delta[col].to_numpy(dtype="float64", na_value=np.nan)
+    return stored, delta
+
+def apply_incremental_update(stored: pd.DataFrame, new: pd.DataFrame, totals: dict = None,
+                             time_col: str = "Period") -> tuple:
+    """
+    Applies only the inserted and updated rows of a new cleaned export to the
+    stored cleaned dataset, matching rows on (IndicatorCode,
+    SpatialDimValueCode, Period).
+
+    Only rows of the new export modified after the stored DateModified, or
+    flagged IsLatestYear, are compared. Cached totals from compute_totals are
+    adjusted by the difference of the changed rows instead of being rebuilt.
+    Rows are matched on integer keys built from the categorical codes, the
+    changed rows are encoded against the stored categories (which are only
+    extended), and IsLatestYear is recomputed only for the indicator/country
+    series the changed rows belong to; the stored rows are only copied into
+    the result, not re-encoded or re-normalised.
+
+    Parameters:
+    - stored: pd.DataFrame, cleaned dataset from the previous release
+    - new: pd.DataFrame, cleaned dataset of the new release
+    - totals: dict, output of compute_totals for stored, updated in place
+    - time_col: str, the column containing time information
+
+    Returns:
+    - (updated DataFrame, DataFrame of the inserted/updated rows)
+    """
+    stored = restore_constants(stored, INCREMENTAL_KEY)
+    new = restore_constants(new, INCREMENTAL_KEY)
+    key = [col for col in INCREMENTAL_KEY if col in stored.columns and col in new.columns]
+
+    # Rows untouched since the stored release cannot differ
+    candidates = new
+    if "DateModified" in new.columns and "DateModified" in stored.columns:
+        # np.array copies: to_numpy() can return a read-only view under Copy-on-Write
+        recent = np.array((new["DateModified"] > stored["DateModified"].max()).fillna(False), dtype=bool)
+        if "IsLatestYear" in new.columns:
+            if new.attrs.get("normalized"):
+                recent |= new["IsLatestYear"].to_numpy(dtype=bool)
+            else:
+                recent |= new["IsLatestYear"].astype(str).str.lower().eq("true").to_numpy(dtype=bool)
+        candidates = new[recent]
+
+    # Only the stored rows sharing a key with a candidate are compared
+    stored_keys, candidate_keys = _row_keys(stored, candidates, key)
+    matched = np.isin(stored_keys, candidate_keys)
+    compared = [col for col in candidates.columns if col in stored.columns and col not in key]
+    previous = stored.loc[matched, compared].assign(_key=stored_keys[matched]).drop_duplicates("_key", keep="last")
+    merged = candidates.assign(_key=candidate_keys).merge(previous, on="_key", how="left",
+                                                          suffixes=("", "_stored"), indicator=True)
+
+    changed = np.array(merged["_merge"] == "left_only", dtype=bool)
+    for col in compared:
+        changed |= _differs(merged[col], merged[col + "_stored"])
+    delta = candidates[changed]
+
+    if delta.empty:
+        logging.info("✅ No inserted or updated rows")
+        return stored, delta
+
+    # Adjust cached totals by (new value - stored value) of the changed rows
+    if totals is not None:
+        column = totals["column"]
+        change = (delta[column].fillna(0).to_numpy(dtype="float64")
+                  - merged.loc[changed, column + "_stored"].fillna(0).to_numpy(dtype="float64"))
+        change = pd.Series(change, index=delta.index)
+        by_location = change.groupby(delta["Location"], observed=True).sum()
+        by_period = change.groupby(_numeric_periods(delta, time_col)).sum()
+        totals["by_location"] = totals["by_location"].add(by_location, fill_value=0).sort_index()
+        totals["by_period"] = totals["by_period"].add(by_period, fill_value=0).sort_index()
+
+    # Keep the integer codes of the stored release stable: only delta is encoded
+    stored_part, delta_part = _align_to_stored(stored, normalize_schema(delta))
+    kept = ~np.isin(stored_keys, candidate_keys[changed])
+    updated = pd.concat([stored_part[kept], delta_part], ignore_index=True)
+    attrs = dict(stored.attrs)
+    if "SpatialDimValueCode" in delta.columns and "Location" in delta.columns:
+        attrs["locations"] = build_location_dictionary(delta, stored.attrs.get("locations"))
+    updated.attrs = attrs
+
+    # A newly inserted year moves the IsLatestYear flag off the previous latest
+    # rows, so only the series the delta touches are recomputed
+    series_key = ["IndicatorCode", "SpatialDimValueCode"]
+    if "IsLatestYear" in updated.columns and set(series_key) <= set(updated.columns):
+        series, delta_series = _row_keys(updated, delta_part, series_key)
+        touched = np.isin(series, delta_series)
+        if pd.api.types.is_bool_dtype(updated["IsLatestYear"]) and not updated["IsLatestYear"].hasnans:
+            flags = np.array(updated["IsLatestYear"], dtype=bool)
+        else:
+            # Flags that are not plain booleans yet are derived for every series
+            flags = np.zeros(len(updated), dtype=bool)
+            touched[:] = True
+        periods = _numeric_periods(updated, time_col)[touched]
+        latest = periods.groupby(series[touched]).transform("max")
+        flags[touched] = (periods == latest).fillna(False).to_numpy(dtype=bool)
+        updated["IsLatestYear"] = flags
+
+    logging.info("✅ Applied %d inserted/updated rows", len(delta))
+    return updated, delta
+
+def refresh_dataset(file_path: str, cache_dir: str = CACHE_DIR, cache_format: str = "parquet", fast: bool = False,
+                    column: str = "FactValueNumeric") -> tuple:
+    """
+    Refreshes the cached cleaned dataset from a new export of file_path,
+    applying only inserted/updated rows and adjusting the cached
+    per-Location and per-Period totals instead of recomputing them.
+
+    Parameters:
+    - file_path: str, path to the new CSV export.
+    - cache_dir: str, directory holding the cache files and manifests.
+    - cache_format: str, "parquet" or "feather".
+    - fast: bool, if True only the analysis columns are parsed, with pinned dtypes.
+    - column: str, the column containing NTD case counts.
+
+    Returns:
+    - (cleaned DataFrame, totals dict as returned by compute_totals)
+    - (None, None) if file is not found or unreadable.
+    """
+    file_path, stat = _stat_source(file_path)
+    if stat is None:
+        return None, None
+    manifest_path, manifest = _read_manifest_for(file_path, cache_dir, cache_format, fast)
+    stored = _read_cache_file(manifest["cache_file"], cache_format) if manifest is not None else None
+
+    totals = None
+    cached_totals = manifest.get("aggregates") if manifest is not None else None
+    if stored is not None and cached_totals is not None and cached_totals["column"] == column:
+        totals = {
+            "column": column,
+            "by_location": pd.Series(cached_totals["by_location"], dtype="float64"),
+            "by_period": pd.Series(cached_totals["by_period"], dtype="float64"),
+        }
+        totals["by_period"].index = pd.to_numeric(totals["by_period"].index)
+
+    sha256 = _file_sha256(file_path)
+    if stored is not None and manifest["sha256"] == sha256:
+        if totals is None:
+            totals = compute_totals(stored, column)
+            manifest["aggregates"] = _totals_to_json(totals)
+            _write_cache_manifest(manifest_path, manifest)
+        logging.info("✅ Source unchanged, using cache: %s", manifest["cache_file"])
+        return stored, totals
+
+    new = load_data(file_path, fast=fast)
+    if new is None:
+        return None, None
+    new = clean_dataset(new)
+
+    if stored is None:
+        df, totals = new, compute_totals(new, column)
+    else:
+        if totals is None:
+            totals = compute_totals(stored, column)
+        df, _ = apply_incremental_update(stored, new, totals)
+
+    _store_cached_dataset(df, file_path, stat, sha256, cache_dir, cache_format, fast, manifest_path, manifest,
+                          aggregates=totals)
+    return df, totals
+
+class MomentAccumulator:
+    """
+    One-pass, mergeable accumulator for the moment-based statistics: count,
+    mean, standard deviation, skewness, kurtosis, min, max and the Pearson
+    correlation of the values with time.
+
+    Each batch is reduced with NumPy and folded into the running central
+    moments with the pairwise update formulas of Chan et al. and Terriberry,
+    so accumulators built over separate chunks or workers can be combined
+    with merge() and give the same result as a single scan.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # Co-moment state over rows where both the value and the time are present
+        self.pair_n = 0
+        self.pair_mean_x = 0.0
+        self.pair_mean_t = 0.0
+        self.pair_m2_x = 0.0
+        self.pair_m2_t = 0.0
+        self.pair_c = 0.0
+
+    def update(self, values, times=None):
+        """
+        Folds a batch of values (and optionally their times) into the state.
+
+        Parameters:
+        - values: array-like of floats, NaN marks a missing value
+        - times: array-like of floats aligned with values, or None
+
+        Returns:
+        - self, so calls can be chained
+        """
+        x = np.asarray(values, dtype="float64")
+        present = ~np.isnan(x)
+        valid = x[present]
+        if valid.size:
+            mean = valid.mean()
+            d = valid - mean
+            d2 = d * d
+            self._merge_moments(valid.size, mean, d2.sum(), (d2 * d).sum(), (d2 * d2).sum())
+            self.min = min(self.min, valid.min())
+            self.max = max(self.max, valid.max())
+
+        if times is not None:
+            t = np.asarray(times, dtype="float64")
+            pairs = present & ~np.isnan(t)
+            if pairs.any():
+                px, pt = x[pairs], t[pairs]
+                mean_x, mean_t = px.mean(), pt.mean()
+                dx, dt = px - mean_x, pt - mean_t
+                self._merge_comoments(px.size, mean_x, mean_t, (dx * dx).sum(), (dt * dt).sum(), (dx * dt).sum())
+        return self
+
+    def merge(self, other: "MomentAccumulator"):
+        """
+        Combines another accumulator's state into this one.
+
+        Parameters:
+        - other: MomentAccumulator, built over a disjoint set of rows
+
+        Returns:
+        - self, so calls can be chained
+        """
+        self._merge_moments(other.n, other.mean, other.m2, other.m3, other.m4)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._merge_comoments(other.pair_n, other.pair_mean_x, other.pair_mean_t,
+                              other.pair_m2_x, other.pair_m2_t, other.pair_c)
+        return self
+
+    def _merge_moments(self, n_b, mean_b, m2_b, m3_b, m4_b):
+        """Merges the central moments of a second sample into the state."""
+        if n_b == 0:
+            return
+        n_a = self.n
+        if n_a == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = n_b, mean_b, m2_b, m3_b, m4_b
+            return
+
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        delta_n = delta / n
+        m2 = self.m2 + m2_b + delta * delta_n * n_a * n_b
+        m3 = (self.m3 + m3_b
+              + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b)
+              + 3 * delta_n * (n_a * m2_b - n_b * self.m2))
+        m4 = (self.m4 + m4_b
+              + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+              + 6 * delta_n ** 2 * (n_a * n_a * m2_b + n_b * n_b * self.m2)
+              + 4 * delta_n * (n_a * m3_b - n_b * self.m3))
+
+        self.n = n
+        self.mean += delta_n * n_b
+        self.m2, self.m3, self.m4 = m2, m3, m4
+
+    def _merge_comoments(self, n_b, mean_x_b, mean_t_b, m2_x_b, m2_t_b, c_b):
+        """Merges the value/time co-moments of a second sample into the state."""
+        if n_b == 0:
+            return
+        n_a = self.pair_n
+        if n_a == 0:
+            self.pair_n, self.pair_mean_x, self.pair_mean_t = n_b, mean_x_b, mean_t_b
+            self.pair_m2_x, self.pair_m2_t, self.pair_c = m2_x_b, m2_t_b, c_b
+            return
+
+        n = n_a + n_b
+        dx = mean_x_b - self.pair_mean_x
+        dt = mean_t_b - self.pair_mean_t
+        weight = n_a * n_b / n
+        self.pair_c += c_b + dx * dt * weight
+        self.pair_m2_x += m2_x_b + dx * dx * weight
+        self.pair_m2_t += m2_t_b + dt * dt * weight
+        self.pair_mean_x += dx * n_b / n
+        self.pair_mean_t += dt * n_b / n
+        self.pair_n = n
+
+    def result(self) -> dict:
+        """
+        Returns the statistics of everything accumulated so far.
+
+        Skewness and kurtosis are the biased (population) estimators, as
+        returned by scipy.stats.skew and scipy.stats.kurtosis; the standard
+        deviation uses ddof=1, as pandas does.
+        """
+        n = self.n
+        spread = self.m2 > 0
+        pair_spread = self.pair_m2_x > 0 and self.pair_m2_t > 0
+        return {
+            "count": n,
+            "mean": self.mean if n else np.nan,
+            "std": np.sqrt(self.m2 / (n - 1)) if n > 1 else np.nan,
+            "skewness": np.sqrt(n) * self.m3 / self.m2 ** 1.5 if spread else np.nan,
+            "kurtosis": n * self.m4 / self.m2 ** 2 - 3.0 if spread else np.nan,
+            "min": self.min if n else np.nan,
+            "max": self.max if n else np.nan,
+            "correlation": self.pair_c / np.sqrt(self.pair_m2_x * self.pair_m2_t) if pair_spread else np.nan,
+        }
+
+class QuantileSketch:
+    """
+    KLL quantile sketch for approximate medians and percentiles in bounded
+    memory.
+
+    Items are kept in a stack of compactors; an item at level h stands for
+    2**h input values. When a level overflows it is sorted and every other
+    item (from a random offset) is promoted to the next level. The
+    normalised rank error is roughly 1.65 / k, so k is derived from the
+    requested error. Sketches built on separate chunks can be merged.
+    """
+
+    def __init__(self, error: float = 0.01, seed: int = None):
+        self.k = max(8, int(np.ceil(1.65 / error)))
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        """Lower levels get geometrically smaller capacities than the top one."""
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values):
+        """
+        Adds a batch of values; NaN values are ignored.
+
+        Returns:
+        - self, so calls can be chained
+        """
+        x = np.asarray(values, dtype="float64")
+        x = x[~np.isnan(x)]
+        if x.size:
+            self.n += x.size
+            self.levels[0] = np.concatenate([self.levels[0], x])
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Combines another sketch into this one.
+
+        Returns:
+        - self, so calls can be chained
+        """
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Compacts every level that exceeds its capacity, bottom up."""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the promoted weight is exact
+                keep = items[-1:] if items.size % 2 else items[:0]
+                paired = items[:items.size - keep.size]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns the approximate q-quantile (0 <= q <= 1), NaN if empty.
+        """
+        if self.n == 0:
+            return np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level.size, 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = min(int(np.searchsorted(cumulative, q * cumulative[-1])), items.size - 1)
+        return float(items[order][position])
+
+class HeavyHitterSketch:
+    """
+    Misra-Gries frequent-items sketch (the deterministic counterpart of
+    Space-Saving) for an approximate mode in bounded memory.
+
+    At most ceil(1 / error) counters are kept and every count is
+    underestimated by at most error * n. Batches are folded in with NumPy
+    and sketches built on separate chunks can be merged.
     """
-    Cleans the dataset by:
-    - Removing empty columns
-    - Converting numeric fields properly
-    - Standardizing country names
-    
-    Parameters:
-    - df: DataFrame, raw dataset
-    
-    Returns:
-    - Cleaned DataFrame
+
+    def __init__(self, error: float = 0.01):
+        self.capacity = max(1, int(np.ceil(1.0 / error)))
+        self.n = 0
+        self.items = np.empty(0)
+        self.counts = np.empty(0, dtype="int64")
+
+    def update(self, values):
+        """
+        Adds a batch of values; NaN values are ignored.
+
+        Returns:
+        - self, so calls can be chained
+        """
+        x = np.asarray(values, dtype="float64")
+        x = x[~np.isnan(x)]
+        if x.size:
+            items, counts = np.unique(x, return_counts=True)
+            self._combine(items, counts)
+            self.n += x.size
+        return self
+
+    def merge(self, other: "HeavyHitterSketch"):
+        """
+        Combines another sketch into this one.
+
+        Returns:
+        - self, so calls can be chained
+        """
+        self._combine(other.items, other.counts)
+        self.n += other.n
+        return self
+
+    def _combine(self, items, counts):
+        """Adds counters, then trims back to capacity by the first dropped count."""
+        items, inverse = np.unique(np.concatenate([self.items, items]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts])).astype("int64")
+        if items.size > self.capacity:
+            threshold = np.sort(counts)[::-1][self.capacity]
+            counts = counts - threshold
+            keep = counts > 0
+            items, counts = items[keep], counts[keep]
+        self.items, self.counts = items, counts
+
+    def mode(self):
+        """
+        Returns the most frequent value (smallest on ties), None if no value
+        is frequent enough to survive in the sketch.
+        """
+        if self.items.size == 0:
+            return None
+        order = np.lexsort((self.items, -self.counts))
+        return float(self.items[order[0]])
+
+class StreamingHistogram:
     """
-    # Drop empty columns
-    df = df.dropna(axis=1, how="all")
+    Mergeable fixed-edge histogram with at most `bins` equal-width bins, so
+    the distribution chart can be drawn from a stream without holding the
+    column in memory.
 
-    # Convert 'Value' column (formatted numbers) to numeric
-    if "Value" in df.columns:
-        df["Value"] = df["Value"].astype(str).str.replace(r"[^\d.]", "", regex=True)
-        df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
+    Bin edges lie on a grid of width 2**exponent anchored at zero. When
+    values fall outside the current window, neighbouring bins are summed
+    pairwise and the width doubled, so existing edges never move and the
+    counts stay exact. A stream ends up with between bins // 2 and bins
+    occupied bins.
+    """
 
-    # Ensure 'FactValueNumeric' is numeric
-    if "FactValueNumeric" in df.columns:
-        df["FactValueNumeric"] = pd.to_numeric(df["FactValueNumeric"], errors="coerce")
+    def __init__(self, bins: int = 30):
+        self.bins = max(2, int(bins))
+        self.n = 0
+        self.exponent = None
+        self.start = 0
+        self.counts = np.zeros(self.bins, dtype="int64")
 
-    return df
+    def update(self, values):
+        """
+        Adds a batch of values; NaN and infinite values are ignored.
+
+        Returns:
+        - self, so calls can be chained
+        """
+        x = np.asarray(values, dtype="float64")
+        x = x[np.isfinite(x)]
+        if x.size == 0:
+            return self
+        low, high = x.min(), x.max()
+        if self.exponent is None:
+            # The first batch spans the window; later batches widen it
+            span = high - low if high > low else max(abs(high), 1.0)
+            self.exponent = int(np.ceil(np.log2(span / (self.bins - 1))))
+            self.start = int(np.floor(low / 2.0 ** self.exponent))
+        width = 2.0 ** self.exponent
+        self._cover(int(np.floor(low / width)), int(np.floor(high / width)))
+
+        index = np.floor(x / 2.0 ** self.exponent).astype("int64") - self.start
+        self.counts += np.bincount(index, minlength=self.bins)
+        self.n += x.size
+        return self
+
+    def merge(self, other: "StreamingHistogram"):
+        """
+        Combines another histogram (with the same number of bins) into this one.
+
+        Returns:
+        - self, so calls can be chained
+        """
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.exponent, self.start, self.counts = other.exponent, other.start, other.counts.copy()
+            self.n = other.n
+            return self
+        if other.exponent > self.exponent:
+            shift = other.exponent - self.exponent
+            self._rebin(other.exponent, self.start >> shift)
 
+        occupied = np.flatnonzero(other.counts)
+        index = (other.start + occupied) >> (self.exponent - other.exponent)
+        self._cover(int(index.min()), int(index.max()))
+        index = (other.start + occupied) >> (self.exponent - other.exponent)
+        np.add.at(self.counts, index - self.start, other.counts[occupied])
+        self.n += other.n
+        return self
 
-def perform_statistical_analysis(df, column="FactValueNumeric"):
+    def _cover(self, first: int, last: int):
+        """Coarsens and moves the window until it holds grid bins first..last and the current counts."""
+        occupied = np.flatnonzero(self.counts)
+        if occupied.size:
+            first = min(first, self.start + int(occupied[0]))
+            last = max(last, self.start + int(occupied[-1]))
+        shift = 0
+        while (last >> shift) - (first >> shift) >= self.bins:
+            shift += 1
+        start = first >> shift
+        if shift or not self.start <= first <= last < self.start + self.bins:
+            self._rebin(self.exponent + shift, start)
+
+    def _rebin(self, exponent: int, start: int):
+        """Moves the counts onto the window of the given grid, summing bins that merge."""
+        occupied = np.flatnonzero(self.counts)
+        index = ((self.start + occupied) >> (exponent - self.exponent)) - start
+        counts = np.zeros(self.bins, dtype="int64")
+        np.add.at(counts, index, self.counts[occupied])
+        self.exponent, self.start, self.counts = exponent, start, counts
+
+    def result(self) -> tuple:
+        """
+        Returns (counts, edges) over the occupied bins, with len(edges) ==
+        len(counts) + 1; both are empty if no value was added.
+        """
+        occupied = np.flatnonzero(self.counts)
+        if occupied.size == 0:
+            return np.empty(0, dtype="int64"), np.empty(0)
+        counts = self.counts[occupied[0]:occupied[-1] + 1].copy()
+        edges = (self.start + int(occupied[0]) + np.arange(counts.size + 1)) * 2.0 ** self.exponent
+        return counts, edges
+
+def _polars_statistical_analysis(frame, column: str = "FactValueNumeric") -> dict:
+    """Polars version of perform_statistical_analysis: all statistics in one query."""
+    import polars as pl
+
+    lazy = frame.lazy()
+    columns = lazy.collect_schema().names() if hasattr(lazy, "collect_schema") else lazy.columns
+    if column not in columns:
+        logging.error("❌ Column '%s' not found in dataset.", column)
+        return
+
+    x = pl.col(column).cast(pl.Float64, strict=False)
+    expressions = [
+        x.mean().alias("Mean"),
+        x.median().alias("Median"),
+        x.drop_nulls().mode().min().alias("Mode"),
+        x.std().alias("Standard Deviation"),
+        x.skew(bias=True).alias("Skewness"),
+        x.kurtosis(fisher=True, bias=True).alias("Kurtosis"),
+        x.min().alias("Minimum"),
+        x.max().alias("Maximum"),
+    ]
+    if "Period" in columns:
+        expressions.append(pl.corr(x, pl.col("Period").cast(pl.Float64, strict=False)).alias("Correlation with Time"))
+
+    row = _polars_collect(lazy.select(expressions)).row(0, named=True)
+    results = {key: np.nan if value is None else value for key, value in row.items()}
+    if row["Mode"] is None:
+        results["Mode"] = "No mode"
+    results.setdefault("Correlation with Time", "N/A")
+    print_statistics_report(results)
+
+    return results
+
+def perform_statistical_analysis(df, column="FactValueNumeric", approximate=False, error=0.01):
     """
     Performs statistical analysis on the dataset.
 
     Parameters:
-    - df: pd.DataFrame, cleaned dataset
+    - df: pd.DataFrame or NTDPanel, cleaned dataset
     - column: str, the column containing NTD case counts
+    - approximate: bool, if True the median and mode come from bounded-memory
+      sketches (QuantileSketch, HeavyHitterSketch) instead of sorting the column
+    - error: float, relative error bound of the sketches
+
+    A Polars frame is summarised in one multithreaded Polars query instead.
+    An NTDPanel is summarised over its present cells (column is ignored).
 
     Returns:
     - Prints statistical results
     """
+    if _is_polars(df):
+        return _polars_statistical_analysis(df, column)
 
-    if column not in df.columns:
-        logging.error("❌ Column '%s' not found in dataset.", column)
-        return
+    if isinstance(df, NTDPanel):
+        values, periods = df.observations()
+        series = pd.Series(values)
+    else:
+        if column not in df.columns:
+            logging.error("❌ Column '%s' not found in dataset.", column)
+            return
+
+        # Correlation with Period (Year) is accumulated in the same pass
+        periods = None
+        if "Period" in df.columns:
+            periods = _numeric_periods(df).to_numpy(dtype="float64", na_value=np.nan)
+
+        values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+        series = df[column]
+
+    # Moment-based statistics in a single scan of the column
+    moments = MomentAccumulator().update(values, periods).result()
 
     # Basic Descriptive Statistics
-    mean_value = df[column].mean()
-    median_value = df[column].median()
-    mode_value = df[column].mode()[0] if not df[column].mode().empty else "No mode"
-    std_dev = df[column].std()
-    skewness = stats.skew(df[column], nan_policy='omit')
-    kurtosis = stats.kurtosis(df[column], nan_policy='omit')
-    min_value = df[column].min()
-    max_value = df[column].max()
-
-    # Correlation with Period (Year)
-    if "Period" in df.columns:
-        df.loc[:, "Period"] = pd.to_numeric(df["Period"], errors="coerce")
-        correlation = df[[column, "Period"]].corr().iloc[0, 1]
+    mean_value = moments["mean"]
+    if approximate:
+        median_value = QuantileSketch(error).update(values).quantile(0.5)
+        mode_value = HeavyHitterSketch(error).update(values).mode()
+        if mode_value is None:
+            mode_value = "No mode"
     else:
-        correlation = "N/A"
+        median_value = series.median()
+        modes = series.mode()
+        mode_value = modes[0] if not modes.empty else "No mode"
+    std_dev = moments["std"]
+    skewness = moments["skewness"]
+    kurtosis = moments["kurtosis"]
+    min_value = moments["min"]
+    max_value = moments["max"]
+    correlation = moments["correlation"] if periods is not None else "N/A"
 
-    # Print results properly formatted
-    print("\n📊 **Statistical Analysis Report** 📊")
-    print(f"✅ Mean: {mean_value:,.2f}")
-    print(f"✅ Median: {median_value:,.2f}")
-    print(f"✅ Mode: {mode_value}")
-    print(f"✅ Standard Deviation: {std_dev:,.2f}")
-    print(f"✅ Skewness: {skewness:.2f} (Distribution shape)")
-    print(f"✅ Kurtosis: {kurtosis:.2f} (Tail heaviness)")
-    print(f"✅ Minimum: {min_value:,.2f}")
-    print(f"✅ Maximum: {max_value:,.2f}")
-    print(f"✅ Correlation with Time (Period): {correlation:.2f}\n")
-
-    return {
+    results = {
         "Mean": mean_value,
         "Median": median_value,
         "Mode": mode_value,
@@ -116,111 +2310,734 @@ def perform_statistical_analysis(df, column="FactValueNumeric"):
         "Maximum": max_value,
         "Correlation with Time": correlation
     }
+    print_statistics_report(results)
+
+    return results
+
+def perform_grouped_analysis(df, by="Location", column="FactValueNumeric", time_col="Period"):
+    """
+    Computes the statistics of perform_statistical_analysis for every group
+    in one vectorised groupby pass, instead of one call per group.
+
+    Parameters:
+    - df: pd.DataFrame, cleaned dataset
+    - by: str or list, grouping column(s), e.g. "Location", "Period" or
+      ["IndicatorCode", "Location"]
+    - column: str, the column containing NTD case counts
+    - time_col: str, the column containing time information
+
+    Returns:
+    - Tidy DataFrame with one row per group and one column per statistic
+    - None if a column is missing
+    """
+    keys = [by] if isinstance(by, str) else list(by)
+    df = restore_constants(df, keys)
+    missing = [col for col in keys + [column] if col not in df.columns]
+    if missing:
+        logging.error("❌ Column(s) %s not found in dataset.", missing)
+        return None
+
+    # Work on a narrow frame so the caller's DataFrame is never mutated
+    work = df[keys].copy()
+    work["_x"] = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    grouped = work.groupby(keys, observed=True)["_x"]
+
+    # Central moments for skewness and kurtosis (biased, as scipy.stats)
+    deviation = work["_x"] - grouped.transform("mean")
+    work["_d2"] = deviation ** 2
+    work["_d3"] = deviation ** 3
+    work["_d4"] = deviation ** 4
+    moments = work.groupby(keys, observed=True)[["_d2", "_d3", "_d4"]].sum()
+    count = grouped.count()
+    spread = moments["_d2"].where(moments["_d2"] > 0)
+    skewness = np.sqrt(count) * moments["_d3"] / spread ** 1.5
+    kurtosis = count * moments["_d4"] / spread ** 2 - 3.0
+
+    # Mode: most frequent value per group, smallest value on ties
+    frequencies = work.dropna(subset=["_x"]).groupby(keys + ["_x"], observed=True).size().reset_index(name="_n")
+    frequencies = frequencies.sort_values(keys + ["_n", "_x"], ascending=[True] * len(keys) + [False, True])
+    mode = frequencies.drop_duplicates(subset=keys).set_index(keys)["_x"]
+
+    # Correlation with Period (Year) over rows where both are present
+    if time_col in df.columns:
+        work["_t"] = _numeric_periods(df, time_col).to_numpy(dtype="float64", na_value=np.nan)
+        paired = work.loc[work["_x"].notna() & work["_t"].notna(), keys + ["_x", "_t"]]
+        paired_groups = paired.groupby(keys, observed=True)
+        dx = paired["_x"] - paired_groups["_x"].transform("mean")
+        dt = paired["_t"] - paired_groups["_t"].transform("mean")
+        co_moments = paired[keys].assign(_xy=dx * dt, _xx=dx ** 2, _tt=dt ** 2).groupby(keys, observed=True).sum()
+        denominator = np.sqrt(co_moments["_xx"] * co_moments["_tt"])
+        correlation = co_moments["_xy"] / denominator.where(denominator > 0)
+    else:
+        correlation = "N/A"
+
+    results = pd.DataFrame({
+        "Mean": grouped.mean(),
+        "Median": grouped.median(),
+        "Mode": mode,
+        "Standard Deviation": grouped.std(),
+        "Skewness": skewness,
+        "Kurtosis": kurtosis,
+        "Minimum": grouped.min(),
+        "Maximum": grouped.max(),
+        "Correlation with Time": correlation
+    })
+    results = results.sort_index(key=_label_order)
+    logging.info("✅ Statistics computed for %d groups by %s", len(results), keys)
+    return results.reset_index()
+
+def _condition_mask(values: pd.Series, condition) -> np.ndarray:
+    """
+    Evaluates one NTDQuery condition on a column: a tuple (low, high) is an
+    inclusive range (None leaves a side open), a list or set is membership,
+    anything else is equality.
+    """
+    if isinstance(condition, tuple):
+        low, high = condition
+        numbers = pd.to_numeric(values, errors="coerce")
+        mask = numbers.notna()
+        if low is not None:
+            mask &= numbers >= low
+        if high is not None:
+            mask &= numbers <= high
+        return mask.fillna(False).to_numpy(dtype=bool)
+    if isinstance(condition, (list, set, frozenset)):
+        return values.isin(list(condition)).to_numpy(dtype=bool)
+    return (values == condition).fillna(False).to_numpy(dtype=bool)
+
+def _clean_piece(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleans a filtered piece of a file read by NTDQuery to the clean_dataset schema."""
+    return normalize_schema(encode_identifiers(convert_numeric_columns(df.copy(deep=False))), force=True)
+
+def _plain_values(index: pd.Index) -> pd.Index:
+    """A categorical index as its plain category values; other indexes unchanged."""
+    if isinstance(index, pd.CategoricalIndex):
+        return index.astype(index.categories.dtype)
+    return index
+
+class NTDQuery:
+    """
+    Lazy, composable query over the NTD dataset.
+
+    filter, select and aggregate only record the operation; collect runs
+    the whole plan once. The optimiser pushes the projection and the
+    filters down to the loader: CSVs are streamed with only the needed
+    columns and each chunk is filtered (and, for aggregations, partially
+    aggregated) as it is read; Parquet files get column and row filters;
+    Arrow IPC files are memory-mapped with load_arrow; in-memory DataFrames
+    (folded constants included) are masked once and copied once.
+
+    Rows read from files are cleaned after filtering, so every source gives
+    the schema of clean_dataset. Aggregations return float64 values (int64
+    counts) indexed by the plain key values. Unknown columns raise KeyError
+    and unreadable sources raise, instead of giving an empty result.
+
+    Example:
+        NTDQuery("data.csv").filter(Period=(2015, 2020)).aggregate(by="Location").collect()
+    """
+
+    AGGREGATIONS = ("sum", "count", "min", "max", "mean")
+
+    def __init__(self, source, chunksize: int = 100_000):
+        """
+        Parameters:
+        - source: str or pd.DataFrame, a CSV/Parquet path (or URL) or a cleaned DataFrame
+        - chunksize: int, rows per chunk when streaming a CSV
+        """
+        self.source = source
+        self.chunksize = chunksize
+        self._filters = []
+        self._columns = None
+        self._aggregation = None
+
+    def _derive(self, **changes) -> "NTDQuery":
+        """Returns a copy of the query with some plan steps replaced."""
+        query = NTDQuery(self.source, self.chunksize)
+        query._filters = list(self._filters)
+        query._columns = self._columns
+        query._aggregation = self._aggregation
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
+
+    def filter(self, **conditions) -> "NTDQuery":
+        """
+        Adds row filters, e.g. filter(Location=["Ghana", "Togo"], Period=(2015, None)).
+        A tuple is an inclusive range, a list/set is membership, a scalar is equality.
+        """
+        return self._derive(_filters=self._filters + list(conditions.items()))
+
+    def select(self, *columns) -> "NTDQuery":
+        """Keeps only the given columns in the result."""
+        return self._derive(_columns=list(columns))
+
+    def aggregate(self, by="Location", column: str = "FactValueNumeric", func: str = "sum") -> "NTDQuery":
+        """
+        Groups the filtered rows by `by` (str or list) and aggregates `column`
+        with one of "sum", "count", "min", "max" or "mean".
+        """
+        if func not in self.AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{func}', expected one of {self.AGGREGATIONS}")
+        keys = [by] if isinstance(by, str) else list(by)
+        return self._derive(_aggregation=(keys, column, func))
+
+    def _required_columns(self) -> list:
+        """Columns the plan needs from the source (None means all of them)."""
+        if self._aggregation is not None:
+            keys, column, _ = self._aggregation
+            needed = keys + [column]
+        elif self._columns is not None:
+            needed = list(self._columns)
+        else:
+            return None
+        return list(dict.fromkeys(needed + [col for col, _ in self._filters]))
+
+    def explain(self) -> str:
+        """Describes the optimised plan."""
+        lines = [f"source: {self.source if isinstance(self.source, str) else 'DataFrame'}",
+                 f"  pushed-down columns: {self._required_columns() or 'all'}"]
+        lines += [f"  pushed-down filter: {col} {condition!r}" for col, condition in self._filters]
+        if self._aggregation is not None:
+            keys, column, func = self._aggregation
+            lines.append(f"  aggregate: {func}({column}) by {keys}")
+        elif self._columns is not None:
+            lines.append(f"  select: {self._columns}")
+        return "\n".join(lines)
+
+    def _mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Combined mask of all filters."""
+        mask = np.ones(len(df), dtype=bool)
+        for col, condition in self._filters:
+            mask &= _condition_mask(df[col], condition)
+        return mask
+
+    def _source_columns(self, source) -> list:
+        """Column names of the source, read from the file header or schema only."""
+        if isinstance(source, pd.DataFrame):
+            return list(source.columns) + list(source.attrs.get("constants", {}))
+        lower = str(source).lower()
+        if lower.endswith(PARQUET_EXTENSIONS):
+            import pyarrow.parquet as pq
+
+            return pq.read_schema(source).names
+        if lower.endswith(ARROW_EXTENSIONS):
+            import pyarrow as pa
+
+            with pa.memory_map(source, "r") as mapped:
+                return pa.ipc.open_file(mapped).schema.names
+        with _open_source(source) as handle:
+            return list(pd.read_csv(handle, nrows=0).columns)
+
+    def _partial(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Partial aggregate of one filtered chunk (sum, count, min and max per group)."""
+        keys, column, _ = self._aggregation
+        values = pd.Series(df[column].to_numpy(dtype="float64", na_value=np.nan), index=df.index, name=column)
+        return values.groupby([df[key] for key in keys], observed=True).agg(["sum", "count", "min", "max"])
+
+    def _finish(self, partials: list) -> pd.Series:
+        """Combines the partial aggregates into the final Series."""
+        keys, column, func = self._aggregation
+        if not partials:
+            return pd.Series(dtype="float64", name=column)
+        combined = pd.concat(partials)
+        # Plain key values, whether the source stored the keys as categoricals or not
+        if isinstance(combined.index, pd.MultiIndex):
+            combined.index = pd.MultiIndex.from_arrays(
+                [_plain_values(combined.index.get_level_values(i)) for i in range(len(keys))], names=keys)
+        else:
+            combined.index = pd.Index(_plain_values(combined.index), name=keys[0])
+        grouped = combined.groupby(level=list(range(len(keys))))
+        if func == "mean":
+            sums = grouped["sum"].sum()
+            result = sums / grouped["count"].sum().where(lambda counts: counts > 0)
+        elif func == "count":
+            result = grouped["count"].sum()
+        else:
+            result = getattr(grouped[func], "sum" if func == "sum" else func)()
+        return result.rename(column)
+
+    def _iter_chunks(self, source, needed: list):
+        """Yields the source in filtered, projected pieces (file pieces are cleaned)."""
+        if isinstance(source, pd.DataFrame):
+            # Columns folded by fold_constant_columns can still be filtered and grouped on
+            source = restore_constants(source, needed)
+            mask = self._mask(source)
+            yield source.loc[mask, needed] if needed is not None else source.loc[mask]
+            return
+
+        if str(source).lower().endswith(PARQUET_EXTENSIONS):
+            row_filters = []
+            for col, condition in self._filters:
+                if isinstance(condition, tuple):
+                    if condition[0] is not None:
+                        row_filters.append((col, ">=", condition[0]))
+                    if condition[1] is not None:
+                        row_filters.append((col, "<=", condition[1]))
+                elif isinstance(condition, (list, set, frozenset)):
+                    row_filters.append((col, "in", list(condition)))
+                else:
+                    row_filters.append((col, "==", condition))
+            df = pd.read_parquet(source, columns=needed, filters=row_filters or None)
+            yield _clean_piece(df[self._mask(df)])
+            return
+
+        if str(source).lower().endswith(ARROW_EXTENSIONS):
+            df = load_arrow(source, columns=needed)
+            if df is None:
+                raise ValueError(f"Could not read Arrow file: {source}")
+            yield _clean_piece(df[self._mask(df)])
+            return
+
+        # Read directly rather than through load_data_chunks, so errors propagate
+        with _open_source(source) as handle:
+            reader = pd.read_csv(handle, chunksize=self.chunksize, **_read_csv_kwargs(needed is not None, needed))
+            for chunk in reader:
+                yield _clean_piece(chunk[self._mask(chunk)])
+
+    def collect(self):
+        """
+        Runs the plan.
+
+        Returns:
+        - pd.Series indexed by the group keys for an aggregation, otherwise a DataFrame
+
+        Raises:
+        - KeyError if the plan uses a column the source does not have
+        - FileNotFoundError (or the reader's error) if the source cannot be read
+        """
+        source = self.source
+        if isinstance(source, str) and _is_remote(source):
+            source = fetch_cached(source)
+
+        available = self._source_columns(source)
+        used = [col for col, _ in self._filters] + list(self._columns or [])
+        if self._aggregation is not None:
+            keys, column, _ = self._aggregation
+            used += keys + [column]
+        unknown = [col for col in dict.fromkeys(used) if col not in available]
+        if unknown:
+            raise KeyError(f"Unknown column(s) {unknown} in query source")
+
+        needed = self._required_columns()
+        if self._aggregation is not None:
+            result = self._finish([self._partial(chunk) for chunk in self._iter_chunks(source, needed) if len(chunk)])
+            logging.info("✅ Query aggregated into %d groups", len(result))
+            return result
+
+        pieces = list(self._iter_chunks(source, needed))
+        if not pieces:
+            df = pd.DataFrame(columns=needed if needed is not None else available)
+        elif len(pieces) == 1:
+            df = pieces[0]
+        else:
+            df = pd.concat(pieces, ignore_index=True)
+        if not isinstance(source, pd.DataFrame) and len(pieces) > 1:
+            # Chunks were encoded separately; give the result one dictionary and dtype
+            df = normalize_schema(encode_identifiers(df), force=True)
+        if self._columns is not None:
+            df = df[self._columns]
+        logging.info("✅ Query returned %d rows", len(df))
+        return df
+
+def _format_stat(value, spec: str) -> str:
+    """Formats a statistic, falling back to str() for placeholders like "N/A"."""
+    try:
+        return format(value, spec)
+    except (TypeError, ValueError):
+        return str(value)
+
+def print_statistics_report(results: dict):
+    """
+    Prints the statistics returned by perform_statistical_analysis.
+
+    Parameters:
+    - results: dict, statistic name to value
+
+    Returns:
+    - Prints statistical results
+    """
+    # Print results properly formatted
+    print("\n📊 **Statistical Analysis Report** 📊")
+    print(f"✅ Mean: {_format_stat(results['Mean'], ',.2f')}")
+    print(f"✅ Median: {_format_stat(results['Median'], ',.2f')}")
+    print(f"✅ Mode: {results['Mode']}")
+    print(f"✅ Standard Deviation: {_format_stat(results['Standard Deviation'], ',.2f')}")
+    print(f"✅ Skewness: {_format_stat(results['Skewness'], '.2f')} (Distribution shape)")
+    print(f"✅ Kurtosis: {_format_stat(results['Kurtosis'], '.2f')} (Tail heaviness)")
+    print(f"✅ Minimum: {_format_stat(results['Minimum'], ',.2f')}")
+    print(f"✅ Maximum: {_format_stat(results['Maximum'], ',.2f')}")
+    print(f"✅ Correlation with Time (Period): {_format_stat(results['Correlation with Time'], '.2f')}\n")
+
+def aggregate_stream(file_path: str, column: str = "FactValueNumeric", time_col: str = "Period",
+                     chunksize: int = 100_000, fast: bool = True, error: float = 0.01, bins: int = 30) -> dict:
+    """
+    Streams a CSV file chunk by chunk and keeps running aggregates, so files
+    larger than memory can be analysed.
+
+    Parameters:
+    - file_path: str, path to the CSV file.
+    - column: str, the column containing NTD case counts.
+    - time_col: str, the column containing time information.
+    - chunksize: int, number of rows per chunk.
+    - fast: bool, if True only the analysis columns are parsed, with pinned dtypes.
+    - error: float, relative error bound of the median and mode sketches.
+    - bins: int, maximum number of bins of the streamed histogram.
+
+    Returns:
+    - dict with "by_location" and "by_period" sums, a "moments" MomentAccumulator,
+      "quantiles" / "heavy_hitters" sketches and a "histogram" StreamingHistogram
+      (pass histogram.result() to plot_histogram).
+    - None if no rows could be read.
+    """
+    aggregates = {
+        "rows": 0,
+        "by_location": pd.Series(dtype="float64"),
+        "by_period": pd.Series(dtype="float64"),
+        "moments": MomentAccumulator(),
+        "quantiles": QuantileSketch(error),
+        "heavy_hitters": HeavyHitterSketch(error),
+        "histogram": StreamingHistogram(bins),
+    }
+
+    for chunk in load_data_chunks(file_path, chunksize=chunksize, fast=fast):
+        aggregates["rows"] += len(chunk)
+        periods = pd.to_numeric(chunk[time_col], errors="coerce")
+
+        # Running per-Location and per-Period sums
+        by_location = chunk.groupby("Location", observed=True)[column].sum()
+        aggregates["by_location"] = aggregates["by_location"].add(by_location, fill_value=0)
+        by_period = chunk[column].groupby(periods).sum()
+        aggregates["by_period"] = aggregates["by_period"].add(by_period, fill_value=0)
+
+        # Running moments and sketches for the descriptive statistics
+        values = chunk[column].to_numpy(dtype="float64", na_value=np.nan)
+        aggregates["moments"].update(values, periods.to_numpy(dtype="float64", na_value=np.nan))
+        aggregates["quantiles"].update(values)
+        aggregates["heavy_hitters"].update(values)
+        aggregates["histogram"].update(values)
+
+    if aggregates["rows"] == 0:
+        logging.error("❌ No rows streamed from: %s", file_path)
+        return None
+
+    aggregates["by_location"] = aggregates["by_location"].sort_index()
+    aggregates["by_period"] = aggregates["by_period"].sort_index()
+    logging.info("✅ Streamed %d rows from %s", aggregates["rows"], file_path)
+    return aggregates
+
+def perform_streaming_analysis(aggregates: dict) -> dict:
+    """
+    Performs statistical analysis on the running aggregates from aggregate_stream.
+
+    The median and mode are approximate, read from the stream's sketches.
+
+    Parameters:
+    - aggregates: dict, output of aggregate_stream
+
+    Returns:
+    - dict with the same keys as perform_statistical_analysis
+    """
+    moments = aggregates["moments"].result()
+    mode_value = aggregates["heavy_hitters"].mode()
+
+    results = {
+        "Mean": moments["mean"],
+        "Median": aggregates["quantiles"].quantile(0.5),
+        "Mode": mode_value if mode_value is not None else "No mode",
+        "Standard Deviation": moments["std"],
+        "Skewness": moments["skewness"],
+        "Kurtosis": moments["kurtosis"],
+        "Minimum": moments["min"],
+        "Maximum": moments["max"],
+        "Correlation with Time": moments["correlation"]
+    }
+    print_statistics_report(results)
+
+    return results
+
+def _quote_identifier(name: str) -> str:
+    """Quotes a column name for SQL (GHO columns contain spaces)."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _quote_literal(value: str) -> str:
+    """Quotes a string literal for SQL."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+class DuckDBBackend:
+    """
+    Runs the chart aggregations and the statistics of
+    perform_statistical_analysis as SQL over CSV or Parquet files with an
+    embedded DuckDB engine, which is multithreaded and spills to disk, so
+    the whole GHO archive can be analysed without loading it into pandas.
+
+    Results have the shapes the pandas functions use: country_totals and
+    yearly_totals return Series for the `totals` argument of the plotting
+    functions, and statistics returns the dict of perform_statistical_analysis.
+    """
+
+    def __init__(self, source, threads: int = None, memory_limit: str = None, temp_directory: str = None):
+        """
+        Parameters:
+        - source: str or list, CSV/Parquet path(s) or glob pattern(s); compressed
+          CSVs (.csv.gz, .csv.zst) are read directly
+        - threads: int, number of DuckDB worker threads (default is all cores)
+        - memory_limit: str, e.g. "8GB"; larger intermediates spill to disk
+        - temp_directory: str, where DuckDB spills
+        """
+        import duckdb
 
-def visualize_top_countries(df: pd.DataFrame, column: str = "FactValueNumeric", top_n: int = 10):
+        self.connection = duckdb.connect()
+        if threads is not None:
+            self.connection.execute(f"SET threads = {int(threads)}")
+        if memory_limit is not None:
+            self.connection.execute(f"SET memory_limit = {_quote_literal(memory_limit)}")
+        if temp_directory is not None:
+            self.connection.execute(f"SET temp_directory = {_quote_literal(temp_directory)}")
+
+        paths = [source] if isinstance(source, str) else list(source)
+        path_list = "[" + ", ".join(_quote_literal(path) for path in paths) + "]"
+        if all(str(path).lower().endswith(PARQUET_EXTENSIONS) for path in paths):
+            reader = f"read_parquet({path_list}, union_by_name = true)"
+        else:
+            reader = f"read_csv_auto({path_list}, union_by_name = true)"
+        self.connection.execute(f"CREATE VIEW ntd AS SELECT * FROM {reader}")
+
+    def _numeric(self, column: str) -> str:
+        """SQL expression casting a column to DOUBLE (NULL where it is not a number)."""
+        return f"TRY_CAST({_quote_identifier(column)} AS DOUBLE)"
+
+    def country_totals(self, column: str = "FactValueNumeric") -> pd.Series:
+        """
+        Returns the per-Location totals, as visualize_top_countries computes them.
+        """
+        result = self.connection.execute(
+            f"SELECT Location, SUM({self._numeric(column)}) AS total FROM ntd "
+            f"WHERE Location IS NOT NULL GROUP BY Location ORDER BY Location"
+        ).df()
+        return result.set_index("Location")["total"].rename(column)
+
+    def yearly_totals(self, column: str = "FactValueNumeric", time_col: str = "Period") -> pd.Series:
+        """
+        Returns the per-Period totals, as plot_trends_with_improved_annotations computes them.
+        """
+        period = self._numeric(time_col)
+        result = self.connection.execute(
+            f"SELECT {period} AS {_quote_identifier(time_col)}, SUM({self._numeric(column)}) AS total FROM ntd "
+            f"WHERE {period} IS NOT NULL GROUP BY 1 ORDER BY 1"
+        ).df()
+        return result.set_index(time_col)["total"].rename(column)
+
+    def statistics(self, column: str = "FactValueNumeric", time_col: str = "Period",
+                   approximate: bool = False) -> dict:
+        """
+        Computes and prints the statistics of perform_statistical_analysis.
+
+        Parameters:
+        - column: str, the column containing NTD case counts
+        - time_col: str, the column containing time information
+        - approximate: bool, if True the median uses DuckDB's approx_quantile
+
+        Returns:
+        - dict with the same keys as perform_statistical_analysis
+        """
+        median = "approx_quantile(x, 0.5)" if approximate else "median(x)"
+        row = self.connection.execute(f"""
+            WITH v AS (SELECT {self._numeric(column)} AS x, {self._numeric(time_col)} AS t FROM ntd),
+                 m AS (SELECT avg(x) AS mean FROM v)
+            SELECT count(x), avg(x), {median}, mode(x), stddev_samp(x), min(x), max(x), corr(x, t),
+                   avg(power(x - m.mean, 2)), avg(power(x - m.mean, 3)), avg(power(x - m.mean, 4))
+            FROM v, m
+        """).fetchone()
+        n, mean_value, median_value, mode_value, std_dev, min_value, max_value, correlation, m2, m3, m4 = [
+            np.nan if value is None else value for value in row
+        ]
+
+        # Biased (population) skewness and kurtosis, as scipy.stats computes them
+        spread = n > 0 and m2 > 0
+        results = {
+            "Mean": mean_value,
+            "Median": median_value,
+            "Mode": mode_value if n > 0 else "No mode",
+            "Standard Deviation": std_dev,
+            "Skewness": m3 / m2 ** 1.5 if spread else np.nan,
+            "Kurtosis": m4 / m2 ** 2 - 3.0 if spread else np.nan,
+            "Minimum": min_value,
+            "Maximum": max_value,
+            "Correlation with Time": correlation
+        }
+        print_statistics_report(results)
+
+        return results
+
+def use_headless_backend():
+    """
+    Switches matplotlib to the non-interactive Agg backend, so charts can be
+    rendered on servers without a display.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+
+def _finish_figure(fig, output_path=None):
+    """
+    Displays the figure, or saves it to one or more paths (the format follows
+    each extension, e.g. .png, .svg, .pdf) and closes it to free its memory.
+    """
+    import matplotlib.pyplot as plt
+
+    if output_path is None:
+        plt.show()
+        return None
+
+    paths = [output_path] if isinstance(output_path, str) else list(output_path)
+    try:
+        for path in paths:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fig.savefig(path, dpi=CHART_DPI, bbox_inches="tight")
+            logging.info("✅ Chart saved to: %s", path)
+    finally:
+        plt.close(fig)
+    return output_path
+
+@contextlib.contextmanager
+def _close_on_error(fig, output_path=None):
+    """
+    Closes a figure that was meant to be saved if drawing it fails, so failed
+    charts do not pile up in long-lived processes such as render workers.
+    """
+    try:
+        yield fig
+    except BaseException:
+        if output_path is not None:
+            import matplotlib.pyplot as plt
+
+            plt.close(fig)
+        raise
+
+def visualize_top_countries(df: pd.DataFrame, column: str = "FactValueNumeric", top_n: int = 10,
+                            totals: pd.Series = None, output_path=None):
     """
     Creates a clean, professional bar chart for the top N countries requiring treatment.
     
     Parameters:
-    - df: pd.DataFrame, cleaned dataset
+    - df: pd.DataFrame or NTDPanel, cleaned dataset
     - column: str, the column to use for ranking (default is "FactValueNumeric")
     - top_n: int, number of top countries to display
+    - totals: pd.Series, optional pre-aggregated per-Location totals (e.g. from aggregate_stream)
+    - output_path: str or list, file path(s) to save the chart to instead of displaying it
     
     Returns:
-    - Displays a well-styled bar chart.
+    - Displays a well-styled bar chart, or returns the saved path(s).
     """
     # Aggregate data and get the top countries
-    ranked_df = df.groupby("Location")[column].sum().sort_values(ascending=False).head(top_n)
+    if totals is None:
+        totals = country_totals(df, column)
+    ranked_df = rank_top(totals, top_n).astype("float64")
+    # Plain labels, so seaborn does not draw every category of a categorical index
+    ranked_df.index = ranked_df.index.astype(str)
     
-    # Create figure with better width to avoid cut-off text
-    plt.figure(figsize=(14, 7))
-    sns.set_theme(style="whitegrid")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-    # Bar plot with warm color palette
-    ax = sns.barplot(
-        x=ranked_df.values, 
-        y=ranked_df.index, 
-        palette="magma_r",  # A warm, professional gradient
-        hue=ranked_df.index, 
-        edgecolor="black"
-    )
-
-    # Titles & labels with adjusted font sizes
-    plt.title(f"Top {top_n} Countries Requiring Treatment", fontsize=18, fontweight="bold", pad=20)
-    plt.xlabel("Total Treatment Needs", fontsize=14, labelpad=15)
-    plt.ylabel("Country", fontsize=14, labelpad=15)
+    # Create figure with better width to avoid cut-off text
+    fig = plt.figure(figsize=(14, 7))
+    with _close_on_error(fig, output_path):
+        sns.set_theme(style="whitegrid")
 
-    # Improve grid styling for subtle elegance
-    ax.xaxis.grid(True, linestyle="--", alpha=0.5)
-    ax.yaxis.grid(False)
+        # Bar plot with warm color palette
+        ax = sns.barplot(
+            x=ranked_df.values, 
+            y=ranked_df.index, 
+            palette="magma_r",  # A warm, professional gradient
+            hue=ranked_df.index, 
+            edgecolor="black"
+        )
 
-    # Remove unnecessary borders
-    sns.despine(left=True, bottom=True)
+        # Titles & labels with adjusted font sizes
+        plt.title(f"Top {top_n} Countries Requiring Treatment", fontsize=18, fontweight="bold", pad=20)
+        plt.xlabel("Total Treatment Needs", fontsize=14, labelpad=15)
+        plt.ylabel("Country", fontsize=14, labelpad=15)
 
-    # Adjust text annotations outside the bars to prevent overlap
-    for index, value in enumerate(ranked_df.values):
-        ax.text(value + (value * 0.01), index, f"{int(value):,}", 
-                va="center", fontsize=12, fontweight="bold", color="black")
+        # Improve grid styling for subtle elegance
+        ax.xaxis.grid(True, linestyle="--", alpha=0.5)
+        ax.yaxis.grid(False)
 
-    # Adjust spacing to ensure full visibility
-    plt.subplots_adjust(left=0.22, right=0.95, top=0.9, bottom=0.1)
+        # Remove unnecessary borders
+        sns.despine(left=True, bottom=True)
 
-    # Show plot
-    plt.show()
+        # Adjust text annotations outside the bars to prevent overlap
+        for index, value in enumerate(ranked_df.values):
+            ax.text(value + (value * 0.01), index, f"{int(value):,}", 
+                    va="center", fontsize=12, fontweight="bold", color="black")
 
-if __name__ == "__main__":
-    file_path = "data.csv"
-    df = load_data(file_path)
-    
-    if df is not None:
-        df_clean = clean_dataset(df)
+        # Adjust spacing to ensure full visibility
+        plt.subplots_adjust(left=0.22, right=0.95, top=0.9, bottom=0.1)
 
-        # Perform Statistical Analysis and Print Results 📊
-        print("\n🔍 Running Statistical Analysis...\n")
-        stats_results = perform_statistical_analysis(df_clean)
+        # Show or save plot
+        return _finish_figure(fig, output_path)
 
 # Generate Histogram for NTD Case Distribution
-def plot_histogram(df, column="FactValueNumeric"):
+def plot_histogram(df=None, column="FactValueNumeric", output_path=None, histogram=None):
     """
     Creates a histogram to visualize the distribution of NTD cases.
 
     Parameters:
-    - df: pd.DataFrame, cleaned dataset.
+    - df: pd.DataFrame, cleaned dataset (unused when histogram is given).
     - column: str, the column containing NTD case counts.
+    - output_path: str or list, file path(s) to save the chart to instead of displaying it.
+    - histogram: tuple, optional pre-binned (counts, edges), e.g.
+      aggregate_stream(...)["histogram"].result(); drawn without the KDE curve.
 
     Returns:
-    - Displays a histogram.
+    - Displays a histogram, or returns the saved path(s).
     """
-    plt.figure(figsize=(10, 6))
-    sns.histplot(df[column], bins=30, kde=True, color="royalblue")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig = plt.figure(figsize=(10, 6))
+    with _close_on_error(fig, output_path):
+        if histogram is not None:
+            counts, edges = histogram
+            edges = np.asarray(edges, dtype="float64")
+            plt.hist(edges[:-1], bins=edges, weights=np.asarray(counts, dtype="float64"), color="royalblue",
+                     edgecolor="white")
+        else:
+            if _is_polars(df):
+                values = pd.Series(_polars_collect(df.lazy().select(column))[column].to_numpy(), name=column)
+            else:
+                values = pd.Series(df[column].to_numpy(dtype="float64", na_value=np.nan), name=column)
+            sns.histplot(values, bins=30, kde=True, color="royalblue")
 
-    plt.title("Distribution of NTD Cases", fontsize=16, fontweight="bold", pad=15)
-    plt.xlabel("NTD Case Counts", fontsize=14)
-    plt.ylabel("Frequency", fontsize=14)
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
+        plt.title("Distribution of NTD Cases", fontsize=16, fontweight="bold", pad=15)
+        plt.xlabel("NTD Case Counts", fontsize=14)
+        plt.ylabel("Frequency", fontsize=14)
+        plt.grid(axis="y", linestyle="--", alpha=0.7)
 
-    plt.show()
+        return _finish_figure(fig, output_path)
 
 # Improve annotation positioning in the line chart
 
-def plot_trends_with_improved_annotations(df, column="FactValueNumeric", time_col="Period"):
+def plot_trends_with_improved_annotations(df, column="FactValueNumeric", time_col="Period", totals=None,
+                                          output_path=None):
     """
     Enhances trend visualization by improving key event annotations.
 
     Parameters:
-    - df: pd.DataFrame, cleaned dataset.
+    - df: pd.DataFrame or NTDPanel, cleaned dataset.
     - column: str, the column containing NTD case counts.
     - time_col: str, the column containing time information.
+    - totals: pd.Series, optional pre-aggregated per-Period totals (e.g. from aggregate_stream).
+    - output_path: str or list, file path(s) to save the chart to instead of displaying it.
 
     Returns:
-    - Displays a line chart with improved annotations.
+    - Displays a line chart with improved annotations, or returns the saved path(s).
     """
-    # Ensure period is numeric and sorted
-    df.loc[:, time_col] = pd.to_numeric(df[time_col], errors="coerce")
-    df = df.sort_values(by=time_col)
-
-    # Aggregate yearly data
-    time_trends = df.groupby(time_col)[column].sum()
+    # Aggregate yearly data (numeric, time-ordered Period)
+    if totals is None:
+        totals = yearly_totals(df, column, time_col)
+    time_trends = totals.sort_index().astype("float64")
 
     # Key events impacting NTD progress
     events = {
@@ -231,33 +3048,194 @@ def plot_trends_with_improved_annotations(df, column="FactValueNumeric", time_co
         2021: "WHO NTD Roadmap 2030"
     }
 
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Plot the line chart
-    plt.figure(figsize=(12, 6))
-    ax = sns.lineplot(x=time_trends.index, y=time_trends.values, marker="o", color="darkred", linewidth=2.5)
+    fig = plt.figure(figsize=(12, 6))
+    with _close_on_error(fig, output_path):
+        ax = sns.lineplot(x=time_trends.index, y=time_trends.values, marker="o", color="darkred", linewidth=2.5)
 
-    # Add vertical event markers and improve annotations
-    for year, event in events.items():
-        if year in time_trends.index:
-            plt.axvline(x=year, color="gray", linestyle="--", alpha=0.7)  # Vertical line for the event
+        # Add vertical event markers and improve annotations
+        for year, event in events.items():
+            if year in time_trends.index:
+                plt.axvline(x=year, color="gray", linestyle="--", alpha=0.7)  # Vertical line for the event
             
-            # Adjust annotation positioning dynamically based on trend values
-            y_position = time_trends.loc[year] * 1.02  # Slightly above the point
-            plt.annotate(event, 
-                         xy=(year, time_trends.loc[year]), 
-                         xytext=(year, y_position), 
-                         fontsize=10, color="black", 
-                         ha="center", arrowprops=dict(arrowstyle="->", color="black", lw=1))
-
-    # Title and labels
-    plt.title("Trends in NTD Cases Over Time (2010-2021) with Key Events", fontsize=16, fontweight="bold", pad=15)
-    plt.xlabel("Year", fontsize=14)
-    plt.ylabel("Total NTD Cases", fontsize=14)
-    plt.xticks(time_trends.index, rotation=45)
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-
-    plt.show()
-
-# Apply visualizations on the cleaned dataset
-visualize_top_countries(df_clean)
-plot_histogram(df_clean)
-plot_trends_with_improved_annotations(df_clean)
+                # Adjust annotation positioning dynamically based on trend values
+                y_position = time_trends.loc[year] * 1.02  # Slightly above the point
+                plt.annotate(event, 
+                             xy=(year, time_trends.loc[year]), 
+                             xytext=(year, y_position), 
+                             fontsize=10, color="black", 
+                             ha="center", arrowprops=dict(arrowstyle="->", color="black", lw=1))
+
+        # Title and labels
+        plt.title("Trends in NTD Cases Over Time (2010-2021) with Key Events", fontsize=16, fontweight="bold", pad=15)
+        plt.xlabel("Year", fontsize=14)
+        plt.ylabel("Total NTD Cases", fontsize=14)
+        plt.xticks(time_trends.index, rotation=45)
+        plt.grid(axis="y", linestyle="--", alpha=0.7)
+
+        return _finish_figure(fig, output_path)
+
+def render_charts(df: pd.DataFrame, output_dir: str = "Images", formats=("png",), column: str = "FactValueNumeric",
+                  top_n: int = 10, prefix: str = "") -> list:
+    """
+    Renders the three charts without a display and saves them to output_dir.
+
+    Parameters:
+    - df: pd.DataFrame, cleaned dataset
+    - output_dir: str, directory to save the charts into
+    - formats: tuple, file formats to save each chart in (e.g. ("png", "svg", "pdf"))
+    - column: str, the column containing NTD case counts
+    - top_n: int, number of top countries to display
+    - prefix: str, prepended to each file name (e.g. a region code)
+
+    Returns:
+    - List of the saved file paths
+    """
+    use_headless_backend()
+
+    def chart_paths(name):
+        return [os.path.join(output_dir, f"{prefix}{name}.{fmt}") for fmt in formats]
+
+    saved = []
+    saved += visualize_top_countries(df, column=column, top_n=top_n,
+                                     output_path=chart_paths(f"top_{top_n}__countries"))
+    saved += plot_histogram(df, column=column, output_path=chart_paths("distribution_of_ntd_cases"))
+    saved += plot_trends_with_improved_annotations(df, column=column, output_path=chart_paths("trends_ntd"))
+    return saved
+
+# Cleaned dataset held by each chart-rendering worker process
+_WORKER_DATASET = None
+
+def _init_render_worker(df: pd.DataFrame):
+    """Receives the dataset once per worker (inherited, not pickled, under fork)."""
+    global _WORKER_DATASET
+    _WORKER_DATASET = df
+    use_headless_backend()
+
+def _select_rows(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    """Keeps the rows matching {column: value or list of values}."""
+    if not filters:
+        return df
+    constants = df.attrs.get("constants", {})
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in filters.items():
+        if col not in df.columns and col in constants:
+            # A folded constant column matches all rows or none
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            mask &= constants[col] in values
+        elif isinstance(value, (list, tuple, set)):
+            mask &= df[col].isin(list(value)).to_numpy(dtype=bool)
+        else:
+            mask &= (df[col] == value).fillna(False).to_numpy(dtype=bool)
+    return df[mask]
+
+def _run_render_job(job: tuple) -> tuple:
+    """Renders one (plot function, filters, output path[, kwargs]) job in a worker."""
+    plot_function, filters, output_path = job[:3]
+    kwargs = job[3] if len(job) > 3 else {}
+    try:
+        plot_function(_select_rows(_WORKER_DATASET, filters), output_path=output_path, **kwargs)
+        return output_path, None
+    except Exception as e:
+        return output_path, str(e)
+
+def build_chart_jobs(df: pd.DataFrame, output_dir: str = "Images", by=("ParentLocation", "IndicatorCode"),
+                     formats=("png",), column: str = "FactValueNumeric", top_n: int = 10) -> list:
+    """
+    Builds the top-N, histogram and trend chart jobs for every group, e.g.
+    every ParentLocation / IndicatorCode pair, for render_chart_jobs.
+
+    Parameters:
+    - df: pd.DataFrame, cleaned dataset
+    - output_dir: str, directory to save the charts into
+    - by: str or tuple, grouping column(s); columns missing from df are ignored
+    - formats: tuple, file formats to save each chart in
+    - column: str, the column containing NTD case counts
+    - top_n: int, number of top countries to display
+
+    Returns:
+    - List of (plot function, filters, output paths, kwargs) jobs
+    """
+    df = restore_constants(df, [by] if isinstance(by, str) else list(by))
+    keys = [by] if isinstance(by, str) else [col for col in by if col in df.columns]
+    groups = df[keys].drop_duplicates().itertuples(index=False, name=None) if keys else [()]
+
+    jobs = []
+    for values in groups:
+        filters = dict(zip(keys, values))
+        prefix = "".join(re.sub(r"[^0-9A-Za-z-]+", "_", str(value)) + "_" for value in values)
+
+        def chart_paths(name):
+            return [os.path.join(output_dir, f"{prefix}{name}.{fmt}") for fmt in formats]
+
+        jobs.append((visualize_top_countries, filters, chart_paths(f"top_{top_n}__countries"),
+                     {"column": column, "top_n": top_n}))
+        jobs.append((plot_histogram, filters, chart_paths("distribution_of_ntd_cases"), {"column": column}))
+        jobs.append((plot_trends_with_improved_annotations, filters, chart_paths("trends_ntd"), {"column": column}))
+    return jobs
+
+def render_chart_jobs(df: pd.DataFrame, jobs: list, max_workers: int = None) -> list:
+    """
+    Renders chart jobs in parallel over a process pool.
+
+    The cleaned dataset is handed to each worker once, when the worker
+    starts, so jobs only carry their filters and output paths.
+
+    Parameters:
+    - df: pd.DataFrame, cleaned dataset
+    - jobs: list, (plot function, filters, output path(s)[, kwargs]) tuples,
+      e.g. from build_chart_jobs
+    - max_workers: int, number of worker processes (default is the CPU count)
+
+    Returns:
+    - List of (output path, error message or None) tuples, in job order
+    """
+    chunksize = max(1, len(jobs) // (4 * (max_workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker, initargs=(df,)) as executor:
+        results = list(executor.map(_run_render_job, jobs, chunksize=chunksize))
+
+    failures = [(path, error) for path, error in results if error is not None]
+    for path, error in failures:
+        logging.error("❌ Could not render %s: %s", path, error)
+    logging.info("✅ Rendered %d of %d chart jobs", len(results) - len(failures), len(results))
+    return results
+
+def main(file_path: str = "data.csv", output_dir: str = None, formats=("png",)):
+    """
+    Runs the full analysis: loads and cleans the dataset, prints the
+    statistics and displays the three charts.
+
+    Parameters:
+    - file_path: str, path to the CSV file.
+    - output_dir: str, if given the charts are rendered headless and saved there.
+    - formats: tuple, file formats used when saving the charts.
+    """
+    df_clean = load_cached_dataset(file_path)
+    
+    if df_clean is not None:
+        # Perform Statistical Analysis and Print Results 📊
+        print("\n🔍 Running Statistical Analysis...\n")
+        stats_results = perform_statistical_analysis(df_clean)
+
+        # Apply visualizations on the cleaned dataset
+        if output_dir is not None:
+            render_charts(df_clean, output_dir=output_dir, formats=formats)
+        else:
+            visualize_top_countries(df_clean)
+            plot_histogram(df_clean)
+            plot_trends_with_improved_annotations(df_clean)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyse WHO NTD data for the Africa region.")
+    parser.add_argument("file_path", nargs="?", default="data.csv", help="path to the CSV file")
+    parser.add_argument("--output-dir", help="save the charts here instead of displaying them")
+    parser.add_argument("--format", dest="formats", action="append", choices=["png", "svg", "pdf"],
+                        help="chart file format (repeatable, default png)")
+    args = parser.parse_args()
+
+    # Set up logging
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main(args.file_path, output_dir=args.output_dir, formats=tuple(args.formats or ("png",)))
@@ -0,0 +1,56 @@
+"""
+Charts rendered to files must not leak figures, even when drawing or saving fails.
+"""
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("seaborn")
+plt = pytest.importorskip("matplotlib.pyplot")
+
+import main_v2
+
+main_v2.use_headless_backend()
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.csv")
+
+
+@pytest.fixture(scope="module")
+def clean():
+    return main_v2.clean_dataset(main_v2.load_data(DATA))
+
+
+def test_failed_charts_close_their_figures(clean, tmp_path):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    open_before = len(plt.get_fignums())
+
+    with pytest.raises(KeyError):
+        main_v2.plot_histogram(clean, column="Missing", output_path=str(tmp_path / "hist.png"))
+    with pytest.raises(OSError):
+        main_v2.visualize_top_countries(clean, output_path=str(blocker / "top.png"))
+    with pytest.raises(OSError):
+        main_v2.plot_trends_with_improved_annotations(clean, output_path=str(blocker / "trends.png"))
+
+    assert len(plt.get_fignums()) == open_before
+
+
+def test_saved_charts_close_their_figures(clean, tmp_path):
+    open_before = len(plt.get_fignums())
+    paths = main_v2.render_charts(clean, output_dir=str(tmp_path), formats=("png",))
+
+    assert len(paths) == 3 and all(os.path.exists(path) for path in paths)
+    assert len(plt.get_fignums()) == open_before
+
+
+def test_histogram_draws_from_streamed_bins(tmp_path):
+    open_before = len(plt.get_fignums())
+    aggregates = main_v2.aggregate_stream(DATA, chunksize=500)
+    counts, edges = aggregates["histogram"].result()
+    assert counts.sum() == aggregates["moments"].n
+
+    paths = main_v2.plot_histogram(histogram=(counts, edges), output_path=str(tmp_path / "hist.png"))
+
+    assert os.path.exists(paths[0])
+    assert len(plt.get_fignums()) == open_before
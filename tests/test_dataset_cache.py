@@ -0,0 +1,36 @@
+"""
+load_cached_dataset must keep one cache per source path, even for files
+sharing a name, size and modification time.
+"""
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import main_v2
+
+HEADER = "IndicatorCode,SpatialDimValueCode,Location,Period,Value,FactValueNumeric\n"
+
+
+def test_same_named_sources_get_their_own_cache(tmp_path):
+    sources = {"afr": ("GHA", "Ghana", 11), "eaf": ("KEN", "Kenya", 22)}
+    paths = {}
+    for region, (code, name, value) in sources.items():
+        (tmp_path / region).mkdir()
+        path = tmp_path / region / "data.csv"
+        path.write_text(HEADER + f"NTD_1,{code},{name},2020,{value},{value}\n")
+        os.utime(path, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+        paths[region] = str(path)
+    assert os.stat(paths["afr"]).st_size == os.stat(paths["eaf"]).st_size
+    cache_dir = str(tmp_path / "cache")
+
+    for _ in range(2):
+        for region, (code, name, value) in sources.items():
+            df = main_v2.load_cached_dataset(paths[region], cache_dir=cache_dir)
+            assert df["Location"].astype(str).tolist() == [name]
+            assert df["FactValueNumeric"].tolist() == [value]
+
+    manifests = [name for name in os.listdir(cache_dir) if name.endswith(".manifest.json")]
+    assert len(manifests) == 2
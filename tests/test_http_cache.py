@@ -0,0 +1,60 @@
+"""
+fetch_cached against a local server: bodies and manifests must not collide.
+"""
+import functools
+import http.server
+import json
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("pandas")
+
+import main_v2
+
+
+@pytest.fixture
+def served_dir(tmp_path):
+    root = tmp_path / "www"
+    root.mkdir()
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(root))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_json_body_is_not_overwritten_by_manifest(served_dir, tmp_path):
+    root, base_url = served_dir
+    body = {"value": [1, 2, 3]}
+    (root / "series.json").write_text(json.dumps(body))
+    cache_dir = str(tmp_path / "cache")
+
+    first = main_v2.fetch_cached(f"{base_url}/series.json", cache_dir=cache_dir)
+    second = main_v2.fetch_cached(f"{base_url}/series.json", cache_dir=cache_dir)
+
+    assert first == second
+    with open(first) as f:
+        assert json.load(f) == body
+    manifests = [name for name in os.listdir(cache_dir) if name.endswith(main_v2.HTTP_CACHE_META_SUFFIX)]
+    assert len(manifests) == 1
+
+
+def test_eviction_skips_cached_json_bodies(served_dir, tmp_path):
+    root, base_url = served_dir
+    for name in ("a.json", "b.json", "c.csv"):
+        (root / name).write_text("x" * 100)
+    cache_dir = str(tmp_path / "cache")
+
+    for name in ("a.json", "b.json", "c.csv"):
+        path = main_v2.fetch_cached(f"{base_url}/{name}", cache_dir=cache_dir, max_bytes=150)
+
+    # Only the most recent response fits; it is never evicted
+    bodies = [name for name in os.listdir(cache_dir) if not name.endswith(main_v2.HTTP_CACHE_META_SUFFIX)]
+    assert bodies == [os.path.basename(path)]
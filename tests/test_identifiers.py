@@ -0,0 +1,49 @@
+"""
+Identifier encoding must keep every row's Location, and results grouped by
+Location must stay in alphabetical order even though the categories follow
+the ISO3 code dictionary.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import main_v2
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "SpatialDimValueCode": ["ZWE", "SWZ", "AFG", None, "SWZ"],
+        "Location": ["Zimbabwe", "Eswatini", "Afghanistan", "Mauritius", "Eswatini"],
+        "Period": [2020, 2020, 2021, 2021, 2021],
+        "FactValueNumeric": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+
+def test_encode_identifiers_keeps_renamed_and_uncoded_locations(frame):
+    stored = {"AFG": "Afghanistan", "SWZ": "Swaziland", "ZWE": "Zimbabwe"}
+    encoded = main_v2.encode_identifiers(frame, stored)
+
+    assert encoded["Location"].astype(object).tolist() == frame["Location"].tolist()
+    assert encoded["SpatialDimValueCode"].isna().tolist() == frame["SpatialDimValueCode"].isna().tolist()
+    # The newer name replaces the stored one, and the code keeps its position
+    assert encoded.attrs["locations"]["SWZ"] == "Eswatini"
+    assert list(encoded.attrs["locations"]) == list(stored)
+
+
+def test_grouped_results_are_in_label_order(frame):
+    dictionary = {"ZWE": "Zimbabwe", "SWZ": "Eswatini", "AFG": "Afghanistan"}
+    encoded = main_v2.encode_identifiers(frame, dictionary)
+    expected = ["Afghanistan", "Eswatini", "Mauritius", "Zimbabwe"]
+
+    totals = main_v2.country_totals(encoded)
+    assert totals.index.astype(str).tolist() == expected
+    assert totals.tolist() == [3.0, 7.0, 4.0, 1.0]
+
+    grouped = main_v2.perform_grouped_analysis(encoded)
+    assert grouped["Location"].astype(str).tolist() == expected
+
+    panel = main_v2.NTDPanel.from_frame(encoded)
+    assert list(panel.locations) == expected
+    assert panel.country_totals().tolist() == totals.tolist()
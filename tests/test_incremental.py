@@ -0,0 +1,62 @@
+"""
+Incremental refreshes must end where a full reclean of the new export does.
+"""
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import main_v2
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.csv")
+KEY = ["IndicatorCode", "SpatialDimValueCode", "Period"]
+
+
+def _by_key(df, columns):
+    out = df[KEY + columns].astype({col: str for col in ("IndicatorCode", "SpatialDimValueCode")})
+    out = out.astype({"Period": "int64"}).set_index(KEY).sort_index()
+    return out.astype({col: "float64" for col in columns if col != "IsLatestYear"})
+
+
+def _assert_matches_full_reclean(df, totals, csv_path):
+    full = main_v2.clean_dataset(main_v2.load_data(csv_path))
+    assert len(df) == len(full)
+    columns = ["FactValueNumeric", "IsLatestYear"]
+    pd.testing.assert_frame_equal(_by_key(df, columns), _by_key(full, columns))
+
+    expected = main_v2.compute_totals(full)
+    for part in ("by_location", "by_period"):
+        got = totals[part].rename(index=str).sort_index().astype("float64")
+        want = expected[part].rename(index=str).sort_index().astype("float64")
+        assert got.to_dict() == pytest.approx(want.to_dict())
+
+
+def test_refresh_twice_matches_full_reclean(tmp_path):
+    csv_path = str(tmp_path / "data.csv")
+    raw = pd.read_csv(DATA)
+    raw.to_csv(csv_path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    main_v2.refresh_dataset(csv_path, cache_dir=cache_dir)
+
+    # First revision: one value corrected
+    raw.loc[3, "FactValueNumeric"] += 1000
+    raw.loc[3, "Value"] = str(int(raw.loc[3, "FactValueNumeric"]))
+    raw.loc[3, "DateModified"] = "2099-01-01T00:00:00.000Z"
+    raw.to_csv(csv_path, index=False)
+    df, totals = main_v2.refresh_dataset(csv_path, cache_dir=cache_dir)
+    _assert_matches_full_reclean(df, totals, csv_path)
+
+    # Second revision: a new year for one series moves its IsLatestYear flag
+    latest = raw[raw["IsLatestYear"]].iloc[0].copy()
+    raw.loc[raw.index[raw["IsLatestYear"]][0], "IsLatestYear"] = False
+    latest["Period"] += 1
+    latest["FactValueNumeric"] = 5
+    latest["Value"] = "5"
+    latest["DateModified"] = "2099-06-01T00:00:00.000Z"
+    raw = pd.concat([raw, latest.to_frame().T], ignore_index=True)
+    raw.to_csv(csv_path, index=False)
+    df, totals = main_v2.refresh_dataset(csv_path, cache_dir=cache_dir)
+    _assert_matches_full_reclean(df, totals, csv_path)
@@ -0,0 +1,72 @@
+"""
+NTDQuery gives the same result for every kind of source and refuses bad plans.
+"""
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import main_v2
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.csv")
+
+
+@pytest.fixture(scope="module")
+def clean():
+    return main_v2.clean_dataset(main_v2.load_data(DATA))
+
+
+@pytest.fixture
+def sources(clean, tmp_path):
+    arrow_path = str(tmp_path / "data.arrow")
+    main_v2.write_arrow(clean, arrow_path)
+    return {
+        "frame": clean,
+        "folded": main_v2.clean_dataset(main_v2.load_data(DATA), fold_constants=True),
+        "csv": DATA,
+        "arrow": arrow_path,
+    }
+
+
+def _query(source, **kwargs):
+    return main_v2.NTDQuery(source, **kwargs).filter(IndicatorCode="SDGNTDTREATMENT", Period=(2015, 2018))
+
+
+@pytest.mark.parametrize("kind", ["frame", "folded", "csv", "arrow"])
+def test_aggregate_is_the_same_for_every_source(sources, clean, kind):
+    result = _query(sources[kind], chunksize=100).aggregate(by="ParentLocation").collect()
+    expected = float(clean.loc[clean["Period"].between(2015, 2018), "FactValueNumeric"].sum())
+
+    assert result.index.tolist() == ["Africa"]
+    assert result.dtype == np.float64
+    assert result.iloc[0] == expected
+
+
+@pytest.mark.parametrize("kind", ["frame", "folded", "csv", "arrow"])
+def test_select_gives_the_clean_schema(sources, kind):
+    columns = ["Location", "Period", "FactValueNumeric", "IsLatestYear"]
+    frame = _query(sources["frame"]).select(*columns).collect()
+    got = _query(sources[kind], chunksize=100).select(*columns).collect()
+
+    assert got.dtypes.astype(str).tolist() == frame.dtypes.astype(str).tolist()
+    key = ["Location", "Period"]
+    pd.testing.assert_frame_equal(
+        got.astype({"Location": str}).sort_values(key).reset_index(drop=True),
+        frame.astype({"Location": str}).sort_values(key).reset_index(drop=True))
+
+
+def test_unknown_column_raises(sources):
+    with pytest.raises(KeyError):
+        main_v2.NTDQuery(sources["csv"]).filter(Locaton="Ghana").aggregate().collect()
+    with pytest.raises(KeyError):
+        main_v2.NTDQuery(sources["frame"]).select("Locaton").collect()
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        main_v2.NTDQuery(str(tmp_path / "missing.csv")).aggregate().collect()
+    with pytest.raises(FileNotFoundError):
+        main_v2.NTDQuery(str(tmp_path / "missing.csv")).select("Location").collect()
@@ -0,0 +1,48 @@
+"""
+The vectorised rankings must agree with a plain sort-based reference.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import main_v2
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(11)
+    n = 5_000
+    return pd.DataFrame({
+        "Period": rng.integers(2010, 2022, n),
+        "Location": rng.choice([f"Country {i:02d}" for i in range(40)], n),
+        # Few distinct values, so totals tie often
+        "FactValueNumeric": rng.integers(0, 4, n).astype("float64"),
+    })
+
+
+def _reference(df, n, ascending):
+    totals = df.groupby(["Period", "Location"])["FactValueNumeric"].sum().reset_index()
+    totals = totals.sort_values(["Period", "FactValueNumeric", "Location"],
+                                ascending=[True, ascending, True], kind="stable")
+    top = totals.groupby("Period").head(n).copy()
+    top["rank"] = top.groupby("Period").cumcount() + 1
+    return top.reset_index(drop=True)
+
+
+@pytest.mark.parametrize("position,ascending", [("top", False), ("bottom", True)])
+def test_rank_by_group_matches_sort_reference(frame, position, ascending):
+    ranked = main_v2.rank_by_group(frame, by="Period", top_n=3, bottom_n=3)
+    got = ranked[ranked["position"] == position].reset_index(drop=True)
+    expected = _reference(frame, 3, ascending)
+
+    assert got["Period"].tolist() == expected["Period"].tolist()
+    assert got["Location"].tolist() == expected["Location"].tolist()
+    assert got["FactValueNumeric"].tolist() == expected["FactValueNumeric"].tolist()
+    assert got["rank"].tolist() == expected["rank"].tolist()
+
+
+def test_rank_top_breaks_ties_by_label():
+    totals = pd.Series([5.0, 7.0, 5.0, 7.0, 1.0], index=["e", "d", "c", "b", "a"])
+    assert main_v2.rank_top(totals, 3).index.tolist() == ["b", "d", "c"]
+    assert main_v2.rank_top(totals, 2, ascending=True).index.tolist() == ["a", "c"]
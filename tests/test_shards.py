@@ -0,0 +1,57 @@
+"""
+Shards cleaned to different numeric dtypes must concatenate to numeric
+columns, not object.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+import main_v2
+
+
+def test_concat_column_mixes_nullable_and_numpy_dtypes():
+    parts = [pd.Series([1, None], dtype="Int64"), pd.Series([2, 3], dtype="int64"),
+             pd.Series([4.5, np.nan]), None]
+    out = main_v2._concat_column(parts, [2, 2, 2, 1])
+    assert out.dtype == np.float64
+    np.testing.assert_array_equal(out, [1, np.nan, 2, 3, 4.5, np.nan, np.nan])
+
+
+def test_load_shards_keeps_count_columns_numeric(tmp_path):
+    base = pd.DataFrame({"IndicatorCode": "NTD_1", "Period": [2019, 2020]})
+    shards = {
+        # Whole counts (Int64 once cleaned), stored as int64 and as float64
+        "int.parquet": base.assign(SpatialDimValueCode="GHA", Location="Ghana", FactValueNumeric=[1, 2]),
+        "nullable.csv": base.assign(SpatialDimValueCode="KEN", Location="Kenya", FactValueNumeric=[3.0, np.nan]),
+        # Fractional values stay float64
+        "float.csv": base.assign(SpatialDimValueCode="MUS", Location="Mauritius", FactValueNumeric=[0.5, 1.5]),
+    }
+    for name, frame in shards.items():
+        path = tmp_path / name
+        frame.to_parquet(path) if name.endswith(".parquet") else frame.to_csv(path, index=False)
+
+    df, errors = main_v2.load_shards(sorted(str(tmp_path / name) for name in shards), max_workers=2)
+
+    assert errors == {}
+    assert df.attrs["normalized"]
+    assert pd.api.types.is_float_dtype(df["FactValueNumeric"])
+    assert df["Period"].dtype == "Int16"
+    totals = main_v2.country_totals(df)
+    assert pd.api.types.is_numeric_dtype(totals)
+    assert totals.to_dict() == {"Ghana": 3.0, "Kenya": 3.0, "Mauritius": 2.0}
+
+
+def test_normalize_schema_stores_whole_counts_as_int64():
+    df = main_v2.normalize_schema(pd.DataFrame({
+        "Period": ["2020", "2021", None],
+        "FactValueNumeric": np.array([1, 2, 3], dtype="int64"),
+        "FactValueNumericLow": [1.0, np.nan, 3.0],
+        "FactValueNumericHigh": pd.array([1.5, None, 2.0], dtype="Float64"),
+    }))
+    assert df["Period"].dtype == "Int16"
+    assert df["FactValueNumeric"].dtype == "Int64"
+    assert df["FactValueNumericLow"].dtype == "Int64"
+    assert df["FactValueNumericLow"].isna().tolist() == [False, True, False]
+    assert df["FactValueNumericHigh"].dtype == np.float64
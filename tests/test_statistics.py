@@ -0,0 +1,91 @@
+"""
+Merged accumulators and sketches must agree with a single scan of the same data.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+import main_v2
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(7)
+    x = rng.lognormal(mean=10, sigma=1.5, size=20_000)
+    x[rng.integers(0, x.size, 500)] = np.nan
+    return x
+
+
+def _chunks(x, n=7):
+    return np.array_split(x, n)
+
+
+def test_moment_accumulator_merge_matches_single_scan(values):
+    times = np.tile(np.arange(2010, 2022, dtype="float64"), values.size // 12 + 1)[:values.size]
+    single = main_v2.MomentAccumulator().update(values, times).result()
+
+    merged = main_v2.MomentAccumulator()
+    for x, t in zip(_chunks(values), _chunks(times)):
+        merged.merge(main_v2.MomentAccumulator().update(x, t))
+    merged = merged.result()
+
+    assert merged["count"] == single["count"] == np.count_nonzero(~np.isnan(values))
+    for key in ("mean", "std", "skewness", "kurtosis", "min", "max", "correlation"):
+        assert merged[key] == pytest.approx(single[key], rel=1e-9, abs=1e-12), key
+    assert single["mean"] == pytest.approx(np.nanmean(values), rel=1e-12)
+    assert single["std"] == pytest.approx(np.nanstd(values, ddof=1), rel=1e-9)
+
+
+def test_quantile_sketch_merge_stays_within_error(values):
+    error = 0.01
+    present = np.sort(values[~np.isnan(values)])
+    single = main_v2.QuantileSketch(error, seed=1).update(values)
+
+    merged = main_v2.QuantileSketch(error, seed=2)
+    for i, x in enumerate(_chunks(values)):
+        merged.merge(main_v2.QuantileSketch(error, seed=10 + i).update(x))
+
+    assert merged.n == single.n == present.size
+    for q in (0.1, 0.5, 0.9):
+        for sketch in (single, merged):
+            rank = np.searchsorted(present, sketch.quantile(q)) / present.size
+            assert abs(rank - q) <= 3 * error, (q, rank)
+
+
+def test_heavy_hitter_sketch_merge_finds_mode():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([np.full(3_000, 42.0), rng.integers(0, 5_000, 17_000).astype("float64")])
+    rng.shuffle(values)
+
+    single = main_v2.HeavyHitterSketch(0.01).update(values)
+    merged = main_v2.HeavyHitterSketch(0.01)
+    for x in _chunks(values):
+        merged.merge(main_v2.HeavyHitterSketch(0.01).update(x))
+
+    assert single.mode() == merged.mode() == 42.0
+    assert merged.n == single.n == values.size
+    # Misra-Gries undercounts by at most error * n
+    true_count = np.count_nonzero(values == 42.0)
+    count = merged.counts[merged.items == 42.0][0]
+    assert true_count - 0.01 * values.size <= count <= true_count
+
+
+def test_streaming_histogram_merge_matches_fixed_edges(values):
+    single = main_v2.StreamingHistogram(30).update(values)
+    merged = main_v2.StreamingHistogram(30)
+    for x in _chunks(values):
+        merged.merge(main_v2.StreamingHistogram(30).update(x))
+    chunked = main_v2.StreamingHistogram(30)
+    for x in _chunks(values):
+        chunked.update(x)
+
+    counts, edges = single.result()
+    present = values[~np.isnan(values)]
+    assert 15 <= counts.size <= 30
+    assert counts.sum() == present.size == merged.n
+    assert edges[0] <= present.min() and present.max() < edges[-1]
+    np.testing.assert_array_equal(counts, np.histogram(present, bins=edges)[0])
+    for other in (merged, chunked):
+        other_counts, other_edges = other.result()
+        np.testing.assert_array_equal(other_counts, np.histogram(present, bins=other_edges)[0])
@@ -0,0 +1,29 @@
+"""
+The cleaning warning and value_mismatches must agree on which rows of
+'Value' disagree with FactValueNumeric.
+"""
+import logging
+import re
+
+import pytest
+
+pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import main_v2
+
+
+def test_warning_counts_the_rows_value_mismatches_reports(caplog):
+    raw = pd.DataFrame({
+        "Value": ["1 200", "3 400", "56", None, None, "7.5"],
+        "FactValueNumeric": [1200.0, 3500.0, None, None, 9.0, 7.5],
+    })
+    report = main_v2.value_mismatches(raw)
+    # The changed number, the Value without a fact and the fact without a Value
+    assert report.index.tolist() == [1, 2, 4]
+
+    with caplog.at_level(logging.WARNING):
+        cleaned = main_v2.convert_numeric_columns(raw.copy())
+    counts = [int(n) for n in re.findall(r"disagrees .* on (\d+) rows", caplog.text)]
+    assert counts == [len(report)]
+    assert cleaned["Value"].tolist()[:3] == [1200.0, 3400.0, 56.0]